@@ -87,6 +87,27 @@ static void handle_write_block(cJSON *root)
     cJSON_Delete(resp);
 }
 
+// Build a READ_DATA object for a block read from EEPROM
+static cJSON *block_to_json(const block_data_t *blk)
+{
+    char serial_hex[9];
+    serial_to_hex(blk->serial, serial_hex);
+
+    // Ensure name is null-terminated for printing
+    char name_buf[BLOCK_NAME_MAX_LEN + 1] = {0};
+    memcpy(name_buf, blk->name, BLOCK_NAME_MAX_LEN);
+
+    cJSON *obj = cJSON_CreateObject();
+    cJSON_AddStringToObject(obj, "response", "READ_DATA");
+    cJSON_AddNumberToObject(obj, "type", blk->type);
+    cJSON_AddNumberToObject(obj, "subtype", blk->subtype);
+    cJSON_AddNumberToObject(obj, "param1", blk->param1);
+    cJSON_AddNumberToObject(obj, "param2", blk->param2);
+    cJSON_AddStringToObject(obj, "serial", serial_hex);
+    cJSON_AddStringToObject(obj, "name", name_buf);
+    return obj;
+}
+
 static void handle_read_block(cJSON *root)
 {
     uint8_t channel = parse_channel(root);
@@ -97,21 +118,36 @@ static void handle_read_block(cJSON *root)
         return;
     }
 
-    char serial_hex[9];
-    serial_to_hex(blk.serial, serial_hex);
-
-    // Ensure name is null-terminated for printing
-    char name_buf[BLOCK_NAME_MAX_LEN + 1] = {0};
-    memcpy(name_buf, blk.name, BLOCK_NAME_MAX_LEN);
+    cJSON *resp = block_to_json(&blk);
+    char *str = cJSON_PrintUnformatted(resp);
+    send_response(str);
+    free(str);
+    cJSON_Delete(resp);
+}
 
+// Read every channel and reply with a single line, so the host pays one
+// round-trip instead of one per channel.
+static void handle_read_all(void)
+{
     cJSON *resp = cJSON_CreateObject();
-    cJSON_AddStringToObject(resp, "response", "READ_DATA");
-    cJSON_AddNumberToObject(resp, "type", blk.type);
-    cJSON_AddNumberToObject(resp, "subtype", blk.subtype);
-    cJSON_AddNumberToObject(resp, "param1", blk.param1);
-    cJSON_AddNumberToObject(resp, "param2", blk.param2);
-    cJSON_AddStringToObject(resp, "serial", serial_hex);
-    cJSON_AddStringToObject(resp, "name", name_buf);
+    cJSON_AddStringToObject(resp, "response", "READ_ALL");
+    cJSON *channels = cJSON_AddArrayToObject(resp, "channels");
+
+    for (uint8_t ch = 0; ch <= PROGRAMMER_MAX_CHANNEL; ch++) {
+        block_data_t blk;
+        cJSON *item;
+        if (programmer_read_block(ch, &blk) == ESP_OK) {
+            item = block_to_json(&blk);
+        } else {
+            item = cJSON_CreateObject();
+            cJSON_AddStringToObject(item, "response", "ERROR");
+            cJSON_AddNumberToObject(item, "code", 3);
+            cJSON_AddStringToObject(item, "message", "Read failed");
+        }
+        cJSON_AddNumberToObject(item, "channel", ch);
+        cJSON_AddItemToArray(channels, item);
+    }
+
     char *str = cJSON_PrintUnformatted(resp);
     send_response(str);
     free(str);
@@ -242,6 +278,8 @@ static void process_command(char *line)
         handle_write_block(root);
     } else if (strcmp(cmd_str, "READ_BLOCK") == 0) {
         handle_read_block(root);
+    } else if (strcmp(cmd_str, "READ_ALL") == 0) {
+        handle_read_all();
     } else if (strcmp(cmd_str, "ERASE_BLOCK") == 0) {
         handle_erase_block(root);
     } else if (strcmp(cmd_str, "VERIFY_BLOCK") == 0) {
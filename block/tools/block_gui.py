@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """Blocko Block Agent GUI - Program EEPROM blocks visually."""
 
+import codecs
+import contextlib
 import json
 import os
+import queue
+import selectors
 import subprocess
 import sys
 import tkinter as tk
@@ -11,8 +15,20 @@ import serial
 import serial.tools.list_ports
 import threading
 import time
-import base64
-import io
+
+# orjson is optional; it encodes straight to bytes and parses faster
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj) + b"\n"
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return (json.dumps(obj) + "\n").encode()
+
+    _loads = json.loads
 
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -22,7 +38,7 @@ IDF_PATH = os.environ.get(
     os.path.expanduser("~/.espressif/v5.5.2/esp-idf"),
 )
 
-# 64x64 3D block icon (embedded PNG)
+# 64x64 3D block icon (embedded PNG), used when icon.png is missing
 APP_ICON_B64 = (
     "iVBORw0KGgoAAAANSUhEUgAAAEAAAABACAYAAACqaXHeAAACLklEQVR4nO2aP05CQRCHB2NlbWfC"
     "FbSh8wicwNLYWHgFCsINLGyMJSfAxtoDQMMBCBQm1rZYmNGJ8ng7s/Nn8e1Xkse++X1vdt8qC1Cp"
@@ -89,6 +105,15 @@ BLOCK_TYPES = {
 
 CATEGORIES = ["All", "Actions", "Movement", "Control Flow", "Sound", "Light", "Wait", "Parameters", "Sensors"]
 
+# Block names per category, as shown in the Block combo
+CATEGORY_NAMES = {"All": tuple(v[0] for v in BLOCK_TYPES.values())}
+for _cat in CATEGORIES[1:]:
+    CATEGORY_NAMES[_cat] = tuple(v[0] for v in BLOCK_TYPES.values() if v[1] == _cat)
+
+# Detail-panel label for each known type_id
+TYPE_STR = {tid: f"{name} (0x{tid:02X})" for tid, (name, _) in BLOCK_TYPES.items()}
+TYPE_STR[255] = "[blank] (0xFF)"
+
 # Reverse lookup: name -> type_id
 NAME_TO_ID = {v[0]: k for k, v in BLOCK_TYPES.items()}
 
@@ -98,6 +123,28 @@ COLOR_DEFAULT_BG = "#d0d0d0"
 COLOR_BLANK = "#f0f0f0"
 COLOR_PROGRAMMED = "#a0d0a0"
 
+# tk.Button options for each channel button state
+_BTN_LOOK = {
+    "selected": dict(relief="solid", bg=COLOR_SELECTED, fg="white",
+                     activebackground=COLOR_SELECTED, activeforeground="white"),
+    "programmed": dict(relief="groove", bg=COLOR_PROGRAMMED, fg="black",
+                       activebackground=COLOR_PROGRAMMED, activeforeground="black"),
+    "blank": dict(relief="groove", bg=COLOR_DEFAULT_BG, fg="black",
+                  activebackground=COLOR_DEFAULT_BG, activeforeground="black"),
+}
+
+# Flash output is forwarded to the Text widget at most every
+# OUTPUT_FLUSH_INTERVAL seconds, or sooner once OUTPUT_FLUSH_BYTES pile up
+OUTPUT_FLUSH_INTERVAL = 0.033
+OUTPUT_FLUSH_BYTES = 16384
+# Flash output keeps the last OUTPUT_MAX_LINES lines, trimmed in steps of
+# OUTPUT_TRIM_SLACK so the delete doesn't run on every append
+OUTPUT_MAX_LINES = 2000
+OUTPUT_TRIM_SLACK = 500
+
+# How long send_command waits for a JSON reply (seconds)
+RESPONSE_TIMEOUT = 0.3
+
 
 def detect_port():
     """Auto-detect the most likely serial port."""
@@ -108,50 +155,155 @@ def detect_port():
     return ports[0] if ports else None
 
 
+def set_low_latency(port):
+    """Drop the USB-serial latency timer to 1 ms on Linux (default is 16 ms).
+
+    Only FTDI-style usb-serial adapters expose this knob; CDC-ACM ports
+    simply don't have the sysfs file, so failure is ignored.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    name = os.path.basename(port)
+    try:
+        with open(f"/sys/bus/usb-serial/devices/{name}/latency_timer", "w") as f:
+            f.write("1")
+    except OSError:
+        pass
+
+
+def _cfg_if_changed(widget, **kw):
+    """widget.config(**kw), skipping options already set to the same value."""
+    last = widget.__dict__.setdefault("_last_kw", {})
+    changed = {k: v for k, v in kw.items() if last.get(k) != v}
+    if changed:
+        widget.config(**changed)
+        last.update(changed)
+
+
 class SerialConnection:
+    """Serial link to the block agent.
+
+    All port access goes through send_command()/send_command_multi() (or a
+    transaction() block), which hold self.lock for the whole write->read
+    cycle so replies can't interleave between callers.
+    """
+
     def __init__(self):
         self.ser = None
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Hold the port lock across several commands."""
+        with self.lock:
+            yield self
 
     def connect(self, port, baud=115200):
-        self.ser = serial.Serial(port, baud, timeout=1)
-        time.sleep(0.3)  # Let ESP boot messages flush
-        self.ser.reset_input_buffer()
+        with self.lock:
+            # pyserial's timeout bounds each read()/read_until() call, so keep it
+            # short and let send_command enforce the overall deadline.
+            self.ser = serial.Serial(port, baud, timeout=0.05)
+            set_low_latency(port)
+            # Discard ESP boot messages until the line stays quiet for one timeout
+            deadline = time.monotonic() + 1.0
+            while self.ser.read(4096) and time.monotonic() < deadline:
+                pass
 
     def disconnect(self):
-        if self.ser and self.ser.is_open:
-            self.ser.close()
-        self.ser = None
+        with self.lock:
+            if self.ser and self.ser.is_open:
+                self.ser.close()
+            self.ser = None
 
     @property
     def connected(self):
         return self.ser is not None and self.ser.is_open
 
     def send_command(self, cmd_dict):
-        if not self.connected:
-            return None
+        """Send a command and return the first JSON line that comes back."""
+        return self._transact(cmd_dict, lambda obj: True)
+
+    def send_command_multi(self, cmd_dict, expect):
+        """Send a command and wait for the reply whose "response" is `expect`.
+
+        Other JSON lines are skipped; an ERROR reply is returned as-is so the
+        caller can tell an unsupported command from a timeout.
+        """
+        return self._transact(
+            cmd_dict, lambda obj: obj.get("response") in (expect, "ERROR"))
+
+    def send_commands(self, cmd_list):
+        """Pipeline several commands and return their replies in order.
+
+        All lines are written back-to-back, then one reply is collected per
+        command (the firmware answers in order). Missing replies are None.
+        """
         with self.lock:
+            if not self.connected:
+                return [None] * len(cmd_list)
+            results = []
             try:
-                line = json.dumps(cmd_dict) + "\n"
-                self.ser.reset_input_buffer()
-                self.ser.write(line.encode())
+                self._drop_stale()
+                self.ser.write(b"".join(_dumps(cmd) for cmd in cmd_list))
                 self.ser.flush()
-                # Read response lines, skip ESP log lines
-                for _ in range(10):
-                    raw = self.ser.readline().decode(errors="replace").strip()
-                    if not raw:
-                        continue
-                    print(f"[serial] rx: {raw}", file=sys.stderr)
-                    if raw.startswith("{"):
-                        try:
-                            return json.loads(raw)
-                        except json.JSONDecodeError:
-                            continue
+                buf = bytearray()
+                for cmd in cmd_list:
+                    resp = self._read_reply(buf, lambda obj: True)
+                    if resp is None:
+                        print(f"[serial] no response for: {cmd.get('cmd')}", file=sys.stderr)
+                    results.append(resp)
+            except Exception as e:
+                print(f"Serial error: {e}", file=sys.stderr)
+            results += [None] * (len(cmd_list) - len(results))
+            return results
+
+    def _transact(self, cmd_dict, accept):
+        with self.lock:
+            if not self.connected:
+                return None
+            try:
+                self._drop_stale()
+                self.ser.write(_dumps(cmd_dict))
+                self.ser.flush()
+                resp = self._read_reply(bytearray(), accept)
+                if resp is not None:
+                    return resp
                 print(f"[serial] no response for: {cmd_dict.get('cmd')}", file=sys.stderr)
             except Exception as e:
                 print(f"Serial error: {e}", file=sys.stderr)
             return None
 
+    def _drop_stale(self):
+        # Drop stale bytes left over from earlier log output
+        stale = self.ser.in_waiting
+        if stale:
+            self.ser.read(stale)
+
+    def _read_reply(self, buf, accept):
+        """Return the next accepted JSON reply, or None after RESPONSE_TIMEOUT.
+
+        Read response lines, skip ESP log lines. Bytes are framed in place in
+        `buf` (kept by the caller across replies) and only lines starting
+        with "{" get decoded.
+        """
+        deadline = time.monotonic() + RESPONSE_TIMEOUT
+        while True:
+            while (i := buf.find(b"\n")) >= 0:
+                raw = bytes(buf[:i]).strip()
+                del buf[:i + 1]
+                if raw[:1] != b"{":
+                    continue
+                print(f"[serial] rx: {raw.decode(errors='replace')}", file=sys.stderr)
+                try:
+                    obj = _loads(raw)
+                except ValueError:
+                    continue
+                if accept(obj):
+                    return obj
+            if time.monotonic() >= deadline:
+                return None
+            buf.extend(self.ser.read(self.ser.in_waiting or 1))
+
     @staticmethod
     def list_ports():
         return [p.device for p in serial.tools.list_ports.comports()]
@@ -165,6 +317,7 @@ class FlashTab:
         self.notebook = notebook
         self.on_done = on_done
         self.process = None
+        self._line_count = 0
 
         # Port selector row
         port_frame = ttk.Frame(self.frame)
@@ -214,6 +367,12 @@ class FlashTab:
             self.text.insert("end", text, tag)
         else:
             self.text.insert("end", text)
+        # Keep only the tail of long build logs
+        self._line_count += text.count("\n")
+        if self._line_count > OUTPUT_MAX_LINES + OUTPUT_TRIM_SLACK:
+            excess = self._line_count - OUTPUT_MAX_LINES
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._line_count = OUTPUT_MAX_LINES
         self.text.see("end")
         self.text.configure(state="disabled")
 
@@ -228,6 +387,7 @@ class FlashTab:
         self.text.configure(state="normal")
         self.text.delete("1.0", "end")
         self.text.configure(state="disabled")
+        self._line_count = 0
 
         self.status_label.configure(text="Building & flashing...", foreground="blue")
         self._append_text(f">>> Building and flashing block firmware to {port}...\n\n", "info")
@@ -240,12 +400,34 @@ class FlashTab:
                     ["bash", "-c", cmd],
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
+                    bufsize=0,
                 )
                 self.process = proc
-                for line in proc.stdout:
-                    self.frame.after(0, self._append_text, line)
+                # Batch output so a full build doesn't post one Tk event per
+                # line; bytes are only decoded when a batch is flushed.
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                fd = proc.stdout.fileno()
+                sel = selectors.DefaultSelector()
+                sel.register(fd, selectors.EVENT_READ)
+                batch = bytearray()
+                last = time.monotonic()
+                eof = False
+                while not eof:
+                    if sel.select(0.1):
+                        chunk = os.read(fd, 65536)
+                        batch.extend(chunk)
+                        eof = not chunk
+                    now = time.monotonic()
+                    if batch and (eof or len(batch) > OUTPUT_FLUSH_BYTES
+                                  or now - last > OUTPUT_FLUSH_INTERVAL):
+                        self.frame.after(0, self._append_text, decoder.decode(bytes(batch)), None)
+                        batch.clear()
+                        last = now
+                # Flush a multi-byte sequence cut off at EOF as U+FFFD
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    self.frame.after(0, self._append_text, tail, None)
+                sel.close()
                 proc.wait()
                 self.frame.after(0, self._on_flash_done, proc.returncode)
             except Exception as e:
@@ -277,6 +459,11 @@ class ProgramTab:
         self.conn = SerialConnection()
         self.selected_channel = 0
         self.channel_data = [None] * 8
+        # Formatted detail strings, keyed on the fields they are built from
+        self._detail_cache = {}
+        # One long-lived worker runs serial jobs in submission order
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._job_worker, daemon=True).start()
         self._build_ui()
         self._select_channel(0)
 
@@ -302,17 +489,21 @@ class ProgramTab:
         ch_frame = ttk.LabelFrame(self.frame, text="Channels (click to select)")
         ch_frame.pack(fill="x", padx=8, pady=8)
 
+        # tk.Buttons rather than ttk styles: the native Windows/macOS themes
+        # ignore ttk background/relief, which would hide the channel state
         self.ch_buttons = []
+        # Last options applied to each button, so unchanged ones are skipped
+        self._btn_state = []
         for i in range(8):
+            opts = dict(text=f"Ch {i}\n---", **_BTN_LOOK["blank"])
             btn = tk.Button(
-                ch_frame, text=f"Ch {i}\n---",
-                width=8, height=2, relief="groove",
-                bg=COLOR_DEFAULT_BG,
-                activebackground=COLOR_SELECTED,
+                ch_frame, width=8, height=2,
                 command=lambda ch=i: self._select_channel(ch),
+                **opts,
             )
             btn.pack(side="left", padx=4, pady=4, expand=True)
             self.ch_buttons.append(btn)
+            self._btn_state.append(opts)
 
         # ── Main content ──
         content = ttk.Frame(self.frame)
@@ -322,7 +513,7 @@ class ProgramTab:
         right = ttk.LabelFrame(content, text="EEPROM Content")
         right.pack(side="right", fill="both", expand=True, padx=(4, 0))
 
-        self.detail_labels = {}
+        self.detail_vars = {}
         fields = [
             ("Channel", "channel"),
             ("Type", "type_str"),
@@ -337,9 +528,13 @@ class ProgramTab:
             ttk.Label(right, text=f"{label}:", font=("", 10, "bold")).grid(
                 row=i, column=0, sticky="w", padx=8, pady=3
             )
-            val = ttk.Label(right, text="---", font=("", 10))
+            var = tk.StringVar(value="---")
+            val = ttk.Label(right, textvariable=var, font=("", 10))
             val.grid(row=i, column=1, sticky="w", padx=8, pady=3)
-            self.detail_labels[key] = val
+            self.detail_vars[key] = var
+            # Only the status field changes color
+            if key == "checksum":
+                self.checksum_label = val
 
         right.columnconfigure(1, weight=1)
 
@@ -389,20 +584,28 @@ class ProgramTab:
         """Auto-connect to the given port after flashing."""
         self.port_var.set(port)
         self._set_status(f"Connecting to {port}...")
-        self.connect_btn.config(state="disabled")
+        _cfg_if_changed(self.connect_btn, state="disabled")
 
         def do_connect():
-            time.sleep(1)  # Give ESP time to boot after flash
-            self.conn.connect(port)
-            return port
+            time.sleep(0.3)  # Give ESP time to boot after flash
+            # The USB port can take a moment to re-enumerate after reset
+            deadline = time.monotonic() + 3
+            while True:
+                try:
+                    self.conn.connect(port)
+                    return port
+                except serial.SerialException:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.2)
 
         def on_connected(result):
-            self.connect_btn.config(state="normal")
+            _cfg_if_changed(self.connect_btn, state="normal")
             if isinstance(result, Exception):
                 self._set_status(f"Auto-connect failed: {result}")
                 return
-            self.connect_btn.config(text="Disconnect")
-            self.conn_label.config(text=f"  Connected: {result}", foreground="green")
+            _cfg_if_changed(self.connect_btn, text="Disconnect")
+            _cfg_if_changed(self.conn_label, text=f"  Connected: {result}", foreground="green")
             self._set_status(f"Connected to {result} - reading channels...")
             self._refresh_all()
 
@@ -411,14 +614,17 @@ class ProgramTab:
     # ── Async helper ────────────────────────────────────────
 
     def _run_async(self, work_fn, done_fn):
-        """Run work_fn in a background thread, then call done_fn(result) on the GUI thread."""
-        def _worker():
+        """Run work_fn on the worker thread, then call done_fn(result) on the GUI thread."""
+        self._jobs.put((work_fn, done_fn))
+
+    def _job_worker(self):
+        while True:
+            work_fn, done_fn = self._jobs.get()
             try:
                 result = work_fn()
             except Exception as e:
                 result = e
-            self.frame.after(0, lambda: done_fn(result))
-        threading.Thread(target=_worker, daemon=True).start()
+            self.frame.after(0, done_fn, result)
 
     # ── Connection ─────────────────────────────────────────
 
@@ -435,8 +641,8 @@ class ProgramTab:
     def _toggle_connect(self):
         if self.conn.connected:
             self.conn.disconnect()
-            self.connect_btn.config(text="Connect")
-            self.conn_label.config(text="  Disconnected", foreground="red")
+            _cfg_if_changed(self.connect_btn, text="Connect")
+            _cfg_if_changed(self.conn_label, text="  Disconnected", foreground="red")
             self._set_status("Disconnected")
         else:
             port = self.port_var.get()
@@ -444,20 +650,20 @@ class ProgramTab:
                 messagebox.showerror("Error", "No port selected. Click 'Refresh Ports'.")
                 return
             self._set_status(f"Connecting to {port}...")
-            self.connect_btn.config(state="disabled")
+            _cfg_if_changed(self.connect_btn, state="disabled")
 
             def do_connect():
                 self.conn.connect(port)
                 return port
 
             def on_connected(result):
-                self.connect_btn.config(state="normal")
+                _cfg_if_changed(self.connect_btn, state="normal")
                 if isinstance(result, Exception):
                     self._set_status(f"Connection failed: {result}")
                     messagebox.showerror("Connection Error", str(result))
                     return
-                self.connect_btn.config(text="Disconnect")
-                self.conn_label.config(text=f"  Connected: {result}", foreground="green")
+                _cfg_if_changed(self.connect_btn, text="Disconnect")
+                _cfg_if_changed(self.conn_label, text=f"  Connected: {result}", foreground="green")
                 self._set_status(f"Connected to {result} - reading channels...")
                 self._refresh_all()
 
@@ -467,18 +673,7 @@ class ProgramTab:
 
     def _select_channel(self, ch):
         self.selected_channel = ch
-        for i, btn in enumerate(self.ch_buttons):
-            if i == ch:
-                btn.config(relief="solid", bg=COLOR_SELECTED, fg="white",
-                           activebackground=COLOR_SELECTED, activeforeground="white")
-            else:
-                data = self.channel_data[i]
-                if data and data.get("type", 255) != 255:
-                    bg = COLOR_PROGRAMMED
-                else:
-                    bg = COLOR_DEFAULT_BG
-                btn.config(relief="groove", bg=bg, fg="black",
-                           activebackground=bg, activeforeground="black")
+        self._recolor_buttons()
 
         # Update detail from cache or read
         if self.conn.connected:
@@ -506,6 +701,7 @@ class ProgramTab:
                 self.channel_data[ch] = resp
                 self._update_detail(ch, resp)
                 self._update_channel_button(ch, resp)
+                self._recolor_buttons()
             else:
                 self.channel_data[ch] = None
                 self._show_no_data(ch)
@@ -514,41 +710,60 @@ class ProgramTab:
         self._run_async(do_read, on_read)
 
     def _show_no_data(self, ch):
-        self.detail_labels["channel"].config(text=str(ch))
-        self.detail_labels["type_str"].config(text="---")
-        self.detail_labels["subtype"].config(text="---")
-        self.detail_labels["param1"].config(text="---")
-        self.detail_labels["param2"].config(text="---")
-        self.detail_labels["serial"].config(text="---")
-        self.detail_labels["name"].config(text="---")
-        self.detail_labels["checksum"].config(text="No data", foreground="gray")
+        self.detail_vars["channel"].set(str(ch))
+        self.detail_vars["type_str"].set("---")
+        self.detail_vars["subtype"].set("---")
+        self.detail_vars["param1"].set("---")
+        self.detail_vars["param2"].set("---")
+        self.detail_vars["serial"].set("---")
+        self.detail_vars["name"].set("---")
+        self.detail_vars["checksum"].set("No data")
+        self.checksum_label.config(foreground="gray")
 
     def _update_detail(self, ch, data):
-        type_id = data.get("type", 255)
-        if type_id in BLOCK_TYPES:
-            name, cat = BLOCK_TYPES[type_id]
-            type_str = f"{name} (0x{type_id:02X})"
-        elif type_id == 255:
-            type_str = "[blank] (0xFF)"
-        else:
-            type_str = f"Unknown (0x{type_id:02X})"
+        key = (data.get("type", 255), data.get("subtype"), data.get("param1"),
+               data.get("param2"), data.get("serial"), data.get("name"))
+        fields = self._detail_cache.get(key)
+        if fields is None:
+            fields = self._format_detail(data)
+            if len(self._detail_cache) >= 64:
+                self._detail_cache.clear()
+            self._detail_cache[key] = fields
+        type_str, subtype, param1, param2, serial_no, name, status, color = fields
+
+        self.detail_vars["channel"].set(str(ch))
+        self.detail_vars["type_str"].set(type_str)
+        self.detail_vars["subtype"].set(subtype)
+        self.detail_vars["param1"].set(param1)
+        self.detail_vars["param2"].set(param2)
+        self.detail_vars["serial"].set(serial_no)
+        self.detail_vars["name"].set(name)
+        self.detail_vars["checksum"].set(status)
+        self.checksum_label.config(foreground=color)
 
-        self.detail_labels["channel"].config(text=str(ch))
-        self.detail_labels["type_str"].config(text=type_str)
-        self.detail_labels["subtype"].config(text=str(data.get("subtype", "---")))
-        self.detail_labels["param1"].config(text=str(data.get("param1", "---")))
-        self.detail_labels["param2"].config(text=str(data.get("param2", "---")))
-        self.detail_labels["serial"].config(text=data.get("serial", "---"))
-        self.detail_labels["name"].config(text=data.get("name", "") or "(empty)")
+        self._set_status(f"Channel {ch}: {type_str}")
 
+    @staticmethod
+    def _format_detail(data):
+        """Build the display strings for one READ_DATA reply."""
+        type_id = data.get("type", 255)
+        type_str = TYPE_STR.get(type_id) or f"Unknown (0x{type_id:02X})"
         if type_id in BLOCK_TYPES:
-            self.detail_labels["checksum"].config(text="Valid - Programmed", foreground="green")
+            status, color = "Valid - Programmed", "green"
         elif type_id == 255:
-            self.detail_labels["checksum"].config(text="Blank EEPROM", foreground="gray")
+            status, color = "Blank EEPROM", "gray"
         else:
-            self.detail_labels["checksum"].config(text="Unknown block type", foreground="orange")
-
-        self._set_status(f"Channel {ch}: {type_str}")
+            status, color = "Unknown block type", "orange"
+        return (
+            type_str,
+            str(data.get("subtype", "---")),
+            str(data.get("param1", "---")),
+            str(data.get("param2", "---")),
+            data.get("serial", "---"),
+            data.get("name", "") or "(empty)",
+            status,
+            color,
+        )
 
     def _update_channel_button(self, ch, data):
         type_id = data.get("type", 255)
@@ -556,37 +771,36 @@ class ProgramTab:
             name = BLOCK_TYPES[type_id][0]
             if len(name) > 10:
                 name = name[:9] + ".."
-            self.ch_buttons[ch].config(text=f"Ch {ch}\n{name}")
+            self._config_button(ch, text=f"Ch {ch}\n{name}")
         elif type_id == 255:
-            self.ch_buttons[ch].config(text=f"Ch {ch}\n[blank]")
+            self._config_button(ch, text=f"Ch {ch}\n[blank]")
         else:
-            self.ch_buttons[ch].config(text=f"Ch {ch}\n0x{type_id:02X}")
-
-        # Re-apply selection colors
-        self._recolor_buttons()
+            self._config_button(ch, text=f"Ch {ch}\n0x{type_id:02X}")
 
     def _recolor_buttons(self):
-        for i, btn in enumerate(self.ch_buttons):
+        for i in range(len(self.ch_buttons)):
             if i == self.selected_channel:
-                btn.config(relief="solid", bg=COLOR_SELECTED, fg="white",
-                           activebackground=COLOR_SELECTED, activeforeground="white")
+                look = "selected"
             else:
                 data = self.channel_data[i]
                 if data and data.get("type", 255) != 255:
-                    bg = COLOR_PROGRAMMED
+                    look = "programmed"
                 else:
-                    bg = COLOR_DEFAULT_BG
-                btn.config(relief="groove", bg=bg, fg="black",
-                           activebackground=bg, activeforeground="black")
+                    look = "blank"
+            self._config_button(i, **_BTN_LOOK[look])
+
+    def _config_button(self, i, **kw):
+        """Apply only the options that differ from what button i already shows."""
+        state = self._btn_state[i]
+        changed = {k: v for k, v in kw.items() if state.get(k) != v}
+        if changed:
+            self.ch_buttons[i].config(**changed)
+            state.update(changed)
 
     # ── Block Type Selection ───────────────────────────────
 
     def _on_category_change(self, event=None):
-        cat = self.cat_var.get()
-        if cat == "All":
-            names = [v[0] for v in BLOCK_TYPES.values()]
-        else:
-            names = [v[0] for v in BLOCK_TYPES.values() if v[1] == cat]
+        names = CATEGORY_NAMES[self.cat_var.get()]
         self.block_combo["values"] = names
         if names:
             self.block_combo.current(0)
@@ -607,12 +821,12 @@ class ProgramTab:
             return
 
         block_name = self.block_var.get()
-        if not block_name or block_name not in NAME_TO_ID:
+        type_id = NAME_TO_ID.get(block_name)
+        if type_id is None:
             messagebox.showwarning("Warning", "Select a block type first.")
             return
 
         ch = self.selected_channel
-        type_id = NAME_TO_ID[block_name]
         label = self.name_var.get().strip()[:15]
 
         self._set_status(f"Writing {block_name} to channel {ch}...")
@@ -673,11 +887,14 @@ class ProgramTab:
         self._set_status("Reading all channels...")
 
         def do_refresh():
-            results = {}
-            for ch in range(8):
-                resp = self.conn.send_command({"cmd": "READ_BLOCK", "channel": ch})
-                results[ch] = resp
-            return results
+            resp = self.conn.send_command_multi({"cmd": "READ_ALL"}, "READ_ALL")
+            if resp and resp.get("response") == "READ_ALL":
+                return {d.get("channel", i): d for i, d in enumerate(resp.get("channels", []))}
+            if not (resp and resp.get("message") == "Unknown command"):
+                return {}
+            # Older firmware without READ_ALL: pipeline one read per channel
+            resps = self.conn.send_commands([{"cmd": "READ_BLOCK", "channel": ch} for ch in range(8)])
+            return dict(enumerate(resps))
 
         def on_refresh(results):
             if isinstance(results, Exception):
@@ -690,7 +907,7 @@ class ProgramTab:
                     self._update_channel_button(ch, resp)
                 else:
                     self.channel_data[ch] = None
-                    self.ch_buttons[ch].config(text=f"Ch {ch}\n???")
+                    self._config_button(ch, text=f"Ch {ch}\n???")
 
             ch = self.selected_channel
             if self.channel_data[ch]:
@@ -705,7 +922,6 @@ class ProgramTab:
 
     def _set_status(self, msg):
         self.status_var.set(msg)
-        self.frame.update_idletasks()
 
 
 def main():
@@ -714,7 +930,9 @@ def main():
     icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")
     if os.path.exists(icon_path):
         root._icon_img = tk.PhotoImage(file=icon_path)
-        root.iconphoto(True, root._icon_img)
+    else:
+        root._icon_img = tk.PhotoImage(data=APP_ICON_B64)
+    root.iconphoto(True, root._icon_img)
     root.geometry("750x600")
     root.resizable(False, False)
     root.configure(bg="#2d1b4e")
@@ -722,9 +940,8 @@ def main():
     # Colorful blocks theme — title bar
     title_frame = tk.Frame(root, bg="#2d1b4e")
     title_frame.pack(fill="x", padx=12, pady=(8, 0))
-    if os.path.exists(icon_path):
-        root._title_icon = tk.PhotoImage(file=icon_path).subsample(2)
-        tk.Label(title_frame, image=root._title_icon, bg="#2d1b4e").pack(side="left", padx=(0, 8))
+    root._title_icon = root._icon_img.subsample(2)
+    tk.Label(title_frame, image=root._title_icon, bg="#2d1b4e").pack(side="left", padx=(0, 8))
     tk.Label(title_frame, text="BLOCK AGENT", font=("Helvetica", 16, "bold"),
              fg="#FF9800", bg="#2d1b4e").pack(side="left")
     tk.Label(title_frame, text="  Program EEPROM blocks",
@@ -654,12 +654,21 @@ void app_main(void)
                         if (all_ff) {
                             ESP_LOGW(TAG, "Channel %d — EEPROM is blank (all 0xFF)", ch);
                         }
+#ifdef CONFIG_BOARD_SERIAL_CMD
+                        // Push the new block to the GUI so it doesn't have to poll
+                        print_block_json(ch, eeprom_data[ch]);
+                        fflush(stdout);
+#endif
                     } else {
                         ESP_LOGE(TAG, "Channel %d — read failed: %s", ch, esp_err_to_name(err));
                     }
 
                 } else if (!present_now && eeprom_present[ch]) {
                     ESP_LOGW(TAG, ">>> EEPROM REMOVED from channel %d <<<", ch);
+#ifdef CONFIG_BOARD_SERIAL_CMD
+                    printf("{\"response\":\"BLOCK_DATA\",\"channel\":%d,\"present\":false}\n", ch);
+                    fflush(stdout);
+#endif
                     if (data_valid[ch]) {
                         memset(eeprom_data[ch], 0, EEPROM_SIZE);
                         data_valid[ch] = false;
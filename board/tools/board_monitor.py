@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Bloco Board Monitor — View connected I2C blocks and send programs to robot."""
 
+import codecs
 import json
 import os
+import queue
+import select
 import subprocess
 import sys
 import threading
@@ -12,6 +15,34 @@ from tkinter import ttk, messagebox
 import serial
 import serial.tools.list_ports
 
+# Faster JSON codecs are optional; fall back to the stdlib. _dumps_bytes
+# returns encoded bytes and _loads accepts bytes, so serial data never
+# round-trips through str.
+try:
+    import orjson
+
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        _json = json
+
+    def _dumps_bytes(obj):
+        return _json.dumps(obj).encode()
+
+    _loads = _json.loads
+
+_NL = b"\n"
+_RESPONSE_KEY = b'"response"'
+
+# Responses that end a send_command() exchange
+_TERMINAL_RESPONSES = frozenset({"SEND_OK", "STATUS", "ERROR"})
+# Hot-plug pushes and SCAN_CHANNELS output; these never answer a
+# send_command() and always go to the events queue
+_EVENT_RESPONSES = frozenset({"BLOCK_DATA", "SCAN_START", "SCAN_END"})
+
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BOARD_PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
@@ -20,6 +51,11 @@ IDF_PATH = os.environ.get(
     os.path.expanduser("~/.espressif/v5.5.2/esp-idf"),
 )
 
+# Flash log keeps the last LOG_MAX_LINES lines, trimmed in steps of
+# LOG_TRIM_SLACK so the delete doesn't run on every flush
+LOG_MAX_LINES = 2000
+LOG_TRIM_SLACK = 500
+
 # Block type names (mirrors block_types.h)
 BLOCK_NAMES = {
     0x01: ("BEGIN", "Actions", "#4CAF50"),
@@ -80,6 +116,33 @@ BLOCK_NAMES = {
     0x8C: ("LOOK_DOWN", "Eyes Look", "#E91E63"),
 }
 
+# Type ids are a single EEPROM byte, so a flat list indexed by type_id
+# replaces the dict lookup on the redraw path. None marks unused ids.
+BLOCK_NAMES_ARR = [None] * 256
+for _k, _v in BLOCK_NAMES.items():
+    BLOCK_NAMES_ARR[_k] = _v
+
+# Slot card rendering: {type_id: (name, category, color, display, text_color)}
+BLOCK_DISPLAY = {
+    k: (n, cat, col, n if len(n) <= 12 else n[:11] + "..",
+        "#000" if n == "WHITE_LIGHT_ON" else "#fff")
+    for k, (n, cat, col) in BLOCK_NAMES.items()
+}
+BLOCK_DISPLAY[0xFF] = ("BLANK", "", "#555", "BLANK", "#fff")
+BLOCK_DISPLAY_ARR = [None] * 256
+for _k, _v in BLOCK_DISPLAY.items():
+    BLOCK_DISPLAY_ARR[_k] = _v
+del _k, _v
+
+
+def block_display(type_id):
+    """Return the slot-card display tuple for type_id (see BLOCK_DISPLAY)."""
+    entry = BLOCK_DISPLAY_ARR[type_id]
+    if entry is None:
+        name = f"0x{type_id:02X}"
+        entry = (name, "Unknown", "#555", name, "#fff")
+    return entry
+
 
 def detect_device_role(port):
     """Open a port briefly and read boot output to detect device role."""
@@ -105,12 +168,23 @@ def detect_device_role(port):
     return None
 
 
+# comports() walks sysfs/udev; share one result between callers for a second
+_PORT_CACHE = {"t": 0.0, "v": []}
+
+
+def _ports_cached():
+    now = time.monotonic()
+    if now - _PORT_CACHE["t"] > 1.0:
+        _PORT_CACHE["v"] = [p.device for p in serial.tools.list_ports.comports()]
+        _PORT_CACHE["t"] = now
+    return _PORT_CACHE["v"]
+
+
 def detect_port(role=None):
     """Detect a serial port, optionally filtering by device role."""
-    candidates = [p.device for p in serial.tools.list_ports.comports()
-                  if "ACM" in p.device or "USB" in p.device]
+    ports = _ports_cached()
+    candidates = [p for p in ports if "ACM" in p or "USB" in p]
     if not candidates:
-        ports = [p.device for p in serial.tools.list_ports.comports()]
         return ports[0] if ports else None
     if role:
         for port in candidates:
@@ -121,58 +195,118 @@ def detect_port(role=None):
 
 
 class SerialConnection:
+    """Serial link to the board.
+
+    A reader thread owns the receive side of the port. JSON lines that
+    answer a send_command() call are handed back to it; scan output and
+    BLOCK_DATA pushed when a block is inserted or removed always go to
+    the `events` queue for the GUI to drain, even mid-command.
+    """
+
     def __init__(self):
         self.ser = None
         self.lock = threading.Lock()
+        self.events = queue.Queue()
+        self._replies = None  # queue for the command in flight, if any
+        self._reader = None
 
     def connect(self, port, baud=115200):
-        self.ser = serial.Serial(port, baud, timeout=1)
+        # Short timeout so the reader thread wakes promptly on partial data
+        # and notices a disconnect quickly
+        self.ser = serial.Serial(port, baud, timeout=0.05)
         time.sleep(0.3)
         self.ser.reset_input_buffer()
+        self._reader = threading.Thread(target=self._read_loop, args=(self.ser,), daemon=True)
+        self._reader.start()
 
     def disconnect(self):
-        if self.ser and self.ser.is_open:
-            self.ser.close()
-        self.ser = None
+        ser, self.ser = self.ser, None
+        if ser and ser.is_open:
+            ser.cancel_read()
+            ser.close()
+        if self._reader:
+            self._reader.join(timeout=1)
+            self._reader = None
 
     @property
     def connected(self):
         return self.ser is not None and self.ser.is_open
 
+    def _read_loop(self, ser):
+        # Drain whatever is buffered in one read and split it into lines
+        # here, instead of one readline() call per line
+        buf = bytearray()
+        while self.ser is ser:
+            try:
+                chunk = ser.read(ser.in_waiting or 1)
+            except Exception as e:
+                if self.ser is ser:
+                    print(f"Serial error: {e}", file=sys.stderr)
+                return
+            if _NL not in chunk:
+                buf += chunk
+                continue
+            buf += chunk
+            *lines, tail = buf.split(_NL)
+            buf = bytearray(tail)
+            for raw in lines:
+                raw = raw.strip()
+                # Every board frame carries a "response" key; a substring
+                # check rejects stray log lines without a JSON parse
+                if raw[:1] != b"{" or raw.find(_RESPONSE_KEY) < 0:
+                    continue
+                try:
+                    obj = _loads(raw)
+                except ValueError:
+                    continue
+                replies = self._replies
+                if replies is not None and obj.get("response") not in _EVENT_RESPONSES:
+                    replies.put(obj)
+                else:
+                    self.events.put(obj)
+
+    def post(self, cmd_dict):
+        """Send a JSON command without waiting; its replies arrive on `events`."""
+        if not self.connected:
+            return False
+        with self.lock:
+            self.ser.write(_dumps_bytes(cmd_dict) + _NL)
+            self.ser.flush()
+        return True
+
     def send_command(self, cmd_dict):
         """Send a JSON command and collect all JSON response lines until done."""
         if not self.connected:
             return None
         with self.lock:
+            replies = self._replies = queue.Queue()
             try:
-                line = json.dumps(cmd_dict) + "\n"
-                self.ser.reset_input_buffer()
-                self.ser.write(line.encode())
+                self.ser.write(_dumps_bytes(cmd_dict) + _NL)
                 self.ser.flush()
 
                 responses = []
-                for _ in range(50):  # read up to 50 lines
-                    raw = self.ser.readline().decode(errors="replace").strip()
-                    if not raw:
-                        continue
-                    if raw.startswith("{"):
-                        try:
-                            obj = json.loads(raw)
-                            responses.append(obj)
-                            # Check for terminal responses
-                            resp = obj.get("response", "")
-                            if resp in ("SCAN_END", "SEND_OK", "STATUS"):
-                                break
-                        except json.JSONDecodeError:
-                            continue
+                deadline = time.monotonic() + 1.0
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        obj = replies.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    responses.append(obj)
+                    if obj.get("response") in _TERMINAL_RESPONSES:
+                        break
                 return responses
             except Exception as e:
                 print(f"Serial error: {e}", file=sys.stderr)
                 return None
+            finally:
+                self._replies = None
 
     @staticmethod
     def list_ports():
-        return [p.device for p in serial.tools.list_ports.comports()]
+        return list(_ports_cached())
 
 
 class FlashTab:
@@ -183,6 +317,10 @@ class FlashTab:
         self.notebook = notebook
         self.on_done = on_done
         self.process = None
+        # (text, tag) chunks from the flash thread, flushed by _flush_log
+        self._log_queue = queue.Queue()
+        self._line_count = 0
+        self._flashing = False
 
         port_frame = ttk.Frame(self.frame)
         port_frame.pack(fill="x", padx=8, pady=(8, 0))
@@ -225,14 +363,41 @@ class FlashTab:
             self.port_var.set(ports[0])
 
     def _append_text(self, text, tag=None):
+        self._insert_chunks([(text, tag)])
+
+    def _insert_chunks(self, chunks):
         self.text.configure(state="normal")
-        if tag:
-            self.text.insert("end", text, tag)
-        else:
-            self.text.insert("end", text)
+        for text, tag in chunks:
+            if tag:
+                self.text.insert("end", text, tag)
+            else:
+                self.text.insert("end", text)
+            self._line_count += text.count("\n")
+        # Keep only the tail of long build logs
+        if self._line_count > LOG_MAX_LINES + LOG_TRIM_SLACK:
+            excess = self._line_count - LOG_MAX_LINES
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._line_count = LOG_MAX_LINES
         self.text.see("end")
         self.text.configure(state="disabled")
 
+    def _flush_log(self):
+        """Move everything queued by the flash thread into the Text widget."""
+        chunks = []
+        while True:
+            try:
+                text, tag = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunks and chunks[-1][1] == tag:
+                chunks[-1] = (chunks[-1][0] + text, tag)
+            else:
+                chunks.append((text, tag))
+        if chunks:
+            self._insert_chunks(chunks)
+        if self._flashing or chunks:
+            self.frame.after(16, self._flush_log)
+
     def start_flash(self):
         port = self.port_var.get()
         if not port:
@@ -244,6 +409,7 @@ class FlashTab:
         self.text.configure(state="normal")
         self.text.delete("1.0", "end")
         self.text.configure(state="disabled")
+        self._line_count = 0
 
         self.status_label.configure(text="Building & flashing...", foreground="blue")
         self._append_text(f">>> Building and flashing board firmware to {port}...\n\n", "info")
@@ -255,21 +421,42 @@ class FlashTab:
                 proc = subprocess.Popen(
                     ["bash", "-c", cmd],
                     stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                    text=True, bufsize=1,
+                    bufsize=0,
                 )
                 self.process = proc
-                for line in proc.stdout:
-                    self.frame.after(0, self._append_text, line)
+                # Pull output in 4 KB chunks rather than line by line
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                fd = proc.stdout.fileno()
+                os.set_blocking(fd, False)
+                while True:
+                    ready, _, _ = select.select([fd], [], [], 0.05)
+                    if not ready:
+                        continue
+                    try:
+                        chunk = os.read(fd, 4096)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        break
+                    self._log_queue.put((decoder.decode(chunk), None))
+                # Flush a multi-byte sequence cut off at EOF as U+FFFD
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    self._log_queue.put((tail, None))
                 proc.wait()
                 self.frame.after(0, self._on_flash_done, proc.returncode)
             except Exception as e:
-                self.frame.after(0, self._append_text, f"\nError: {e}\n", "error")
+                self._log_queue.put((f"\nError: {e}\n", "error"))
                 self.frame.after(0, self._on_flash_done, 1)
 
+        self._flashing = True
         threading.Thread(target=run_flash, daemon=True).start()
+        self.frame.after(16, self._flush_log)
 
     def _on_flash_done(self, returncode):
         self.process = None
+        self._flashing = False
+        self._flush_log()  # output still queued goes before the result line
         self.flash_btn.configure(state="normal")
         self.port_combo.configure(state="readonly")
 
@@ -313,6 +500,14 @@ class SlotsTab:
 
         self.cards_canvas = tk.Canvas(slots_frame, bg="#2d2d2d", highlightthickness=0)
         self.cards_canvas.pack(fill="both", expand=True, padx=4, pady=4)
+        self.cards_canvas.bind("<Configure>", self._on_canvas_resize)
+        self._last_draw_key = None
+        # Canvas size and card layout, updated from <Configure>
+        self._canvas_size = (600, 250)
+        self._geom = None
+        # Canvas item ids per slot, reused until the layout changes
+        self._slot_items = {}
+        self._slot_layout = None
 
         # Details panel
         detail_frame = ttk.LabelFrame(self.frame, text="Block Details")
@@ -350,13 +545,23 @@ class SlotsTab:
         ttk.Label(self.frame, textvariable=self.status_var, relief="sunken", anchor="w").pack(
             fill="x", side="bottom", padx=8, pady=(0, 8))
 
-        # Auto-refresh timer
-        self.auto_scan_active = False
         self.selected_channel = None
+        self._scan_pending = False
+        self._scan_id = 0
+
+        # Unsolicited/async board messages, keyed by "response"
+        self._resp_handlers = {
+            "BLOCK_DATA": self._handle_block_data,
+            "SCAN_START": self._handle_scan_start,
+            "SCAN_END": self._handle_scan_end,
+        }
 
         # Draw empty slots
         self.frame.after(100, self._draw_slots)
 
+        # Pick up BLOCK_DATA the board pushes on insert/remove
+        self.frame.after(50, self._drain_queue)
+
     def auto_connect(self, port):
         self.port_var.set(port)
         self.frame.after(1500, self._do_connect)
@@ -373,7 +578,6 @@ class SlotsTab:
 
     def _toggle_connect(self):
         if self.conn.connected:
-            self.auto_scan_active = False
             self.conn.disconnect()
             self.connect_btn.config(text="Connect")
             self.conn_label.config(text="  Disconnected", foreground="red")
@@ -402,9 +606,7 @@ class SlotsTab:
             self.connect_btn.config(text="Disconnect")
             self.conn_label.config(text=f"  Connected: {result}", foreground="green")
             self.status_var.set(f"Connected — scanning slots...")
-            self.auto_scan_active = True
             self._scan_all()
-            self._auto_scan_loop()
 
         self._run_async(work, done)
 
@@ -424,33 +626,69 @@ class SlotsTab:
 
         self.status_var.set("Scanning I2C slots...")
         self.scan_btn.config(state="disabled")
+        self._scan_pending = True
+        self._scan_id += 1
+        scan_id = self._scan_id
 
+        # Replies are parsed by the reader thread and picked up in _drain_queue
         def work():
-            return self.conn.send_command({"cmd": "SCAN_CHANNELS"})
+            return self.conn.post({"cmd": "SCAN_CHANNELS"})
 
-        def done(responses):
-            self.scan_btn.config(state="normal")
-            if isinstance(responses, Exception) or not responses:
-                self.status_var.set("Scan failed")
-                return
+        def done(sent):
+            if isinstance(sent, Exception) or not sent:
+                self._scan_done("Scan failed")
+            else:
+                self.frame.after(2000, self._scan_timeout, scan_id)
 
-            self.channels = {}
-            for resp in responses:
-                if resp.get("response") == "BLOCK_DATA":
-                    ch = resp.get("channel", -1)
-                    self.channels[ch] = resp
+        self._run_async(work, done)
 
-            present = sum(1 for d in self.channels.values() if d.get("present"))
-            self.status_var.set(f"Found {present} block(s) across {len(self.channels)} channels")
+    def _scan_timeout(self, scan_id):
+        if self._scan_pending and scan_id == self._scan_id:
+            self._scan_done("Scan failed")
+
+    def _scan_done(self, status):
+        self._scan_pending = False
+        self.scan_btn.config(state="normal")
+        self.status_var.set(status)
+
+    def _drain_queue(self):
+        self._slots_changed = False
+        self._scan_ended = False
+        handlers = self._resp_handlers
+        while True:
+            try:
+                resp = self.conn.events.get_nowait()
+            except queue.Empty:
+                break
+            handler = handlers.get(resp.get("response"))
+            if handler:
+                handler(resp)
+
+        # Redraw once per drain, however many lines arrived
+        if self._slots_changed:
             self._draw_slots()
+            if self.selected_channel is not None:
+                self._select_slot(self.selected_channel)
+        if self._scan_ended:
+            present = sum(1 for d in self.channels.values() if d.get("present"))
+            self._scan_done(f"Found {present} block(s) across {len(self.channels)} channels")
+        self.frame.after(50, self._drain_queue)
 
-        self._run_async(work, done)
+    def _handle_block_data(self, resp):
+        ch = resp.get("channel", -1)
+        if self.channels.get(ch) != resp:
+            self.channels[ch] = resp
+            self._slots_changed = True
 
-    def _auto_scan_loop(self):
-        if not self.auto_scan_active or not self.conn.connected:
-            return
-        self._scan_all()
-        self.frame.after(2000, self._auto_scan_loop)
+    def _handle_scan_start(self, resp):
+        # Forget channels the board no longer reports
+        n = resp.get("num_channels", len(self.channels))
+        for ch in [ch for ch in self.channels if not 0 <= ch < n]:
+            del self.channels[ch]
+            self._slots_changed = True
+
+    def _handle_scan_end(self, resp):
+        self._scan_ended = True
 
     def _send_to_robot(self):
         if not self.conn.connected:
@@ -476,107 +714,127 @@ class SlotsTab:
 
         self._run_async(work, done)
 
-    def _draw_slots(self):
-        c = self.cards_canvas
-        c.delete("all")
-
-        w = c.winfo_width() or 600
-        h = c.winfo_height() or 250
+    def _on_canvas_resize(self, event):
+        self._canvas_size = (event.width, event.height)
+        self._geom = None
+        self._last_draw_key = None
+        self._draw_slots()
 
+    def _slot_geometry(self):
+        """Return (card_w, card_h, start_x, y), recomputed only on resize or
+        when the number of slots changes."""
         num_slots = max(len(self.channels), 2)
-        card_w = min(120, (w - 40) // num_slots - 10)
-        card_h = 160
-        total_w = num_slots * (card_w + 10) - 10
-        start_x = max(20, (w - total_w) // 2)
-        y = max(20, (h - card_h) // 2 - 10)
-
-        if not self.channels:
-            # Draw placeholder slots
-            for i in range(2):
-                x = start_x + i * (card_w + 10)
-                c.create_rectangle(x, y, x + card_w, y + card_h,
-                                   fill="#3a3a3a", outline="#555", width=1, dash=(4, 4))
-                c.create_text(x + card_w // 2, y + card_h // 2,
-                              text=f"Slot {i}\n\nEmpty", fill="#666",
-                              font=("Helvetica", 10), justify="center")
-            return
+        if self._geom is None or self._geom[0] != num_slots:
+            w, h = self._canvas_size
+            card_w = min(120, (w - 40) // num_slots - 10)
+            card_h = 160
+            total_w = num_slots * (card_w + 10) - 10
+            start_x = max(20, (w - total_w) // 2)
+            y = max(20, (h - card_h) // 2 - 10)
+            self._geom = (num_slots, card_w, card_h, start_x, y)
+        return self._geom[1:]
 
-        for ch, data in sorted(self.channels.items()):
-            x = start_x + ch * (card_w + 10)
-            present = data.get("present", False)
-
-            if present:
-                type_id = data.get("type", 0xFF)
-                if type_id in BLOCK_NAMES:
-                    name, category, color = BLOCK_NAMES[type_id]
-                elif type_id == 0xFF:
-                    name, category, color = "BLANK", "", "#555"
-                else:
-                    name, category, color = f"0x{type_id:02X}", "Unknown", "#555"
-
-                is_selected = (ch == self.selected_channel)
-
-                # Card outline
-                if is_selected:
-                    c.create_rectangle(x - 3, y - 3, x + card_w + 3, y + card_h + 3,
-                                       outline="#FFD700", width=3)
-
-                # Card body
-                c.create_rectangle(x, y, x + card_w, y + card_h,
-                                   fill=color, outline="#fff", width=1)
-
-                # Slot number
-                c.create_rectangle(x, y, x + card_w, y + 22, fill="#1a1a1a", outline="")
-                c.create_text(x + card_w // 2, y + 11,
-                              text=f"SLOT {ch}", fill="#fff",
-                              font=("Helvetica", 8, "bold"))
-
-                # Block name
-                text_color = "#000" if name == "WHITE_LIGHT_ON" else "#fff"
-                display = name if len(name) <= 12 else name[:11] + ".."
-                c.create_text(x + card_w // 2, y + card_h // 2,
-                              text=display, fill=text_color,
-                              font=("Helvetica", 10, "bold"), width=card_w - 8)
-
-                # Category
-                if category:
-                    c.create_text(x + card_w // 2, y + card_h // 2 + 20,
-                                  text=category, fill=text_color,
-                                  font=("Helvetica", 7))
-
-                # Block label from EEPROM
-                block_name = data.get("name", "")
-                if block_name and block_name.strip():
-                    c.create_text(x + card_w // 2, y + card_h - 20,
-                                  text=block_name[:12], fill=text_color,
-                                  font=("Helvetica", 8, "italic"))
-
-                # Checksum indicator
-                if data.get("checksum_valid"):
-                    c.create_oval(x + card_w - 14, y + card_h - 14,
-                                  x + card_w - 4, y + card_h - 4,
-                                  fill="#4CAF50", outline="")
-                else:
-                    c.create_oval(x + card_w - 14, y + card_h - 14,
-                                  x + card_w - 4, y + card_h - 4,
-                                  fill="#f44336", outline="")
-
-                # Click handler
-                tag = f"slot_{ch}"
-                c.addtag_withtag(tag, c.create_rectangle(x, y, x + card_w, y + card_h,
-                                                          fill="", outline="", width=0))
-                c.tag_bind(tag, "<Button-1>", lambda e, channel=ch: self._select_slot(channel))
+    def _draw_slots(self):
+        c = self.cards_canvas
+        w, h = self._canvas_size
 
-            else:
-                # Empty slot
-                c.create_rectangle(x, y, x + card_w, y + card_h,
-                                   fill="#3a3a3a", outline="#555", width=1, dash=(4, 4))
-                c.create_text(x + card_w // 2, y + 11,
-                              text=f"SLOT {ch}", fill="#888",
-                              font=("Helvetica", 8, "bold"))
-                c.create_text(x + card_w // 2, y + card_h // 2,
-                              text="No Block\nInserted", fill="#666",
-                              font=("Helvetica", 9), justify="center")
+        # Skip the redraw when nothing visible has changed
+        key = (tuple(sorted((ch, d.get("type"), d.get("present"), d.get("checksum_valid"), d.get("name", ""))
+                            for ch, d in self.channels.items())),
+               w, h)
+        if key == self._last_draw_key:
+            return
+        self._last_draw_key = key
+
+        card_w, card_h, start_x, y = self._slot_geometry()
+
+        # Card items are only recreated when the slots or layout change;
+        # otherwise the existing items are reconfigured in place
+        layout = (tuple(sorted(self.channels)), card_w, card_h, start_x, y)
+        if layout != self._slot_layout:
+            self._slot_layout = layout
+            c.delete("all")
+            self._slot_items = {}
+            if not self.channels:
+                # Draw placeholder slots
+                for i in range(2):
+                    x = start_x + i * (card_w + 10)
+                    c.create_rectangle(x, y, x + card_w, y + card_h,
+                                       fill="#3a3a3a", outline="#555", width=1, dash=(4, 4))
+                    c.create_text(x + card_w // 2, y + card_h // 2,
+                                  text=f"Slot {i}\n\nEmpty", fill="#666",
+                                  font=("Helvetica", 10), justify="center")
+            for ch in sorted(self.channels):
+                self._slot_items[ch] = self._create_slot_items(ch, card_w, card_h, start_x, y)
+            # One selection outline per layout; _place_selection moves it
+            c.create_rectangle(0, 0, 0, 0, outline="#FFD700", width=3,
+                               state="hidden", tags=("selection",))
+
+        for ch, data in self.channels.items():
+            self._update_slot_items(self._slot_items[ch], data)
+        self._place_selection()
+
+    def _create_slot_items(self, ch, card_w, card_h, x0, y):
+        """Create the canvas items for one slot card and return their ids."""
+        c = self.cards_canvas
+        x = x0 + ch * (card_w + 10)
+        cx = x + card_w // 2
+        items = {
+            "body": c.create_rectangle(x, y, x + card_w, y + card_h, width=1),
+            "header": c.create_rectangle(x, y, x + card_w, y + 22, fill="#1a1a1a", outline=""),
+            "slot": c.create_text(cx, y + 11, text=f"SLOT {ch}",
+                                  font=("Helvetica", 8, "bold")),
+            "name": c.create_text(cx, y + card_h // 2, width=card_w - 8, justify="center"),
+            "cat": c.create_text(cx, y + card_h // 2 + 20, font=("Helvetica", 7)),
+            "label": c.create_text(cx, y + card_h - 20, font=("Helvetica", 8, "italic")),
+            "checksum": c.create_oval(x + card_w - 14, y + card_h - 14,
+                                      x + card_w - 4, y + card_h - 4, outline=""),
+            # Click handler
+            "hit": c.create_rectangle(x, y, x + card_w, y + card_h,
+                                      fill="", outline="", width=0, tags=(f"slot_{ch}",)),
+        }
+        c.tag_bind(f"slot_{ch}", "<Button-1>", lambda e, channel=ch: self._select_slot(channel))
+        return items
+
+    def _update_slot_items(self, items, data):
+        """Reconfigure a slot card's existing items for its current block."""
+        c = self.cards_canvas
+        if data.get("present", False):
+            _, category, color, display, text_color = block_display(data.get("type", 0xFF))
+            block_name = data.get("name", "")
+            c.itemconfigure(items["body"], fill=color, outline="#fff", dash="")
+            c.itemconfigure(items["header"], state="normal")
+            c.itemconfigure(items["slot"], fill="#fff")
+            c.itemconfigure(items["name"], text=display, fill=text_color,
+                            font=("Helvetica", 10, "bold"))
+            c.itemconfigure(items["cat"], text=category, fill=text_color,
+                            state="normal" if category else "hidden")
+            c.itemconfigure(items["label"], text=block_name[:12], fill=text_color,
+                            state="normal" if block_name.strip() else "hidden")
+            c.itemconfigure(items["checksum"], state="normal",
+                            fill="#4CAF50" if data.get("checksum_valid") else "#f44336")
+            c.itemconfigure(items["hit"], state="normal")
+        else:
+            # Empty slot
+            c.itemconfigure(items["body"], fill="#3a3a3a", outline="#555", dash=(4, 4))
+            c.itemconfigure(items["header"], state="hidden")
+            c.itemconfigure(items["slot"], fill="#888")
+            c.itemconfigure(items["name"], text="No Block\nInserted", fill="#666",
+                            font=("Helvetica", 9))
+            for k in ("cat", "label", "checksum", "hit"):
+                c.itemconfigure(items[k], state="hidden")
+
+    def _place_selection(self):
+        """Move the selection outline onto the selected card, or hide it."""
+        c = self.cards_canvas
+        ch = self.selected_channel
+        if ch is None or not self.channels.get(ch, {}).get("present"):
+            c.itemconfigure("selection", state="hidden")
+            return
+        card_w, card_h, start_x, y = self._slot_geometry()
+        x = start_x + ch * (card_w + 10)
+        c.coords("selection", x - 3, y - 3, x + card_w + 3, y + card_h + 3)
+        c.itemconfigure("selection", state="normal")
 
     def _select_slot(self, ch):
         self.selected_channel = ch
@@ -589,12 +847,13 @@ class SlotsTab:
                 if key != "channel":
                     self.detail_labels[key].config(text="---")
             self.status_var.set(f"Slot {ch}: empty")
-            self._draw_slots()
+            self._place_selection()
             return
 
         type_id = data.get("type", 0xFF)
-        if type_id in BLOCK_NAMES:
-            name, category, _ = BLOCK_NAMES[type_id]
+        entry = BLOCK_NAMES_ARR[type_id]
+        if entry is not None:
+            name, category, _ = entry
             self.detail_labels["type_str"].config(text=f"{name} (0x{type_id:02X})")
             self.detail_labels["category"].config(text=category)
         elif type_id == 0xFF:
@@ -616,8 +875,8 @@ class SlotsTab:
             text=f"p1={data.get('param1', '?')}  p2={data.get('param2', '?')}  "
                  f"sub={data.get('subtype', '?')}  v={data.get('version', '?')}")
 
-        self.status_var.set(f"Slot {ch}: {BLOCK_NAMES.get(type_id, ('?',))[0]}")
-        self._draw_slots()
+        self.status_var.set(f"Slot {ch}: {entry[0] if entry else '?'}")
+        self._place_selection()
 
 
 class SimulatorTab:
@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 """Bloco Robot Simulator - Flash robo firmware and monitor received programs."""
 
+import codecs
+import contextlib
+import json
 import os
+import queue
 import re
+import selectors
 import subprocess
 import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, font as tkfont
 import serial
 import serial.tools.list_ports
 import threading
@@ -19,6 +24,16 @@ IDF_PATH = os.environ.get(
     "IDF_PATH",
     os.path.expanduser("~/.espressif/v5.5.2/esp-idf"),
 )
+IDF_ENV_CACHE = os.path.expanduser("~/.cache/bloco/idf_env.json")
+
+# Variables export.sh adds or changes, filled in by load_idf_env(); None
+# until then, in which case flashing sources export.sh itself
+_IDF_ENV = None
+
+# Serial log keeps at most LOG_MAX_LINES lines; past that it is cut back to
+# LOG_KEEP_LINES in one delete rather than trimmed line by line
+LOG_MAX_LINES = 2000
+LOG_KEEP_LINES = 1500
 
 # Block type names (mirrors block_types.h)
 BLOCK_NAMES = {
@@ -61,6 +76,143 @@ BLOCK_COLORS = {
     "LOOK_UP": "#E91E63", "LOOK_DOWN": "#E91E63",
 }
 
+# Type ids are one byte; index these by type_id instead of going through
+# the name and color dicts for every received block
+_NAME_TABLE = tuple(BLOCK_NAMES.get(i, f"0x{i:02X}") for i in range(256))
+_COLOR_TABLE = tuple(BLOCK_COLORS.get(n, "#607D8B") for n in _NAME_TABLE)
+
+# Program/executor events in the robo log. _parse_event splits the fixed
+# formats with str.partition and only falls back to this regex for lines
+# that carry an event prefix but don't parse; group names are event kinds.
+_LINE_RE = re.compile(
+    r"(?P<pstart>Program start: expecting (?P<n>\d+) block)"
+    r"|(?P<rblock>Received block (?P<idx>\d+): type=0x(?P<tid>[0-9A-Fa-f]{1,2})\s+name=(?P<nm>\S*))"
+    r"|(?P<pend>Program end)"
+    r"|(?P<exec>\[(?P<ei>\d+)\] type=0x)"
+    r"|(?P<pfin>Program finished|Program END)"
+)
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def _match_event(line):
+    """Slow path of _parse_event: run _LINE_RE over the whole line."""
+    m = _LINE_RE.search(line)
+    kind = m.lastgroup if m else None
+    if kind == "pstart":
+        return kind, m.group("n")
+    if kind == "rblock":
+        return kind, (int(m.group("idx")), int(m.group("tid"), 16), m.group("nm"))
+    if kind == "exec":
+        return kind, int(m.group("ei"))
+    return kind, None
+
+
+def _parse_event(line):
+    """Return (kind, value) for a program/executor event line.
+
+    kind is a _LINE_RE group name, or None for ordinary log lines. value
+    is the block count for "pstart", (index, type_id, label) for
+    "rblock", the step index for "exec", and None otherwise.
+    """
+    # "Received block N: type=0xXX name=..."
+    i = line.find("Received block ")
+    if i >= 0:
+        idx, sep, rest = line[i + 15:].partition(": type=0x")
+        tid, _, rest = rest.partition(" ")
+        rest = rest.lstrip()
+        if (sep and idx.isdigit() and 0 < len(tid) <= 2 and _HEX_DIGITS.issuperset(tid)
+                and rest.startswith("name=")):
+            label = rest[5:].split(None, 1)[0] if rest[5:6].strip() else ""
+            return "rblock", (int(idx), int(tid, 16), label)
+        return _match_event(line)
+
+    # Executor lines: "[N] type=0xXX"
+    i = line.find("] type=0x")
+    if i >= 0:
+        j = line.rfind("[", 0, i)
+        if j >= 0 and line[j + 1:i].isdigit():
+            return "exec", int(line[j + 1:i])
+        return _match_event(line)
+
+    # "Program start: expecting N blocks"
+    i = line.find("Program start: expecting ")
+    if i >= 0:
+        count, sep, _ = line[i + 25:].partition(" block")
+        if sep and count.isdigit():
+            return "pstart", count
+        return _match_event(line)
+
+    if "Program end" in line:
+        return "pend", None
+    if "Program finished" in line or "Program END" in line:
+        return "pfin", None
+    return None, None
+
+
+# Receive events already imply the "recv" log tag, so those lines skip
+# the keyword scan in _line_tag
+_EVENT_TAGS = {"pstart": "recv", "rblock": "recv"}
+
+
+def _line_tag(line):
+    """Pick the serial log tag for a line from its keywords."""
+    if "Program start" in line or "Received block" in line:
+        return "recv"
+    if "Executing" in line or "Forward" in line or "Backward" in line or \
+       "Turn" in line or "Shake" in line or "Spin" in line or "Beep" in line or \
+       "Eyes:" in line or "Program END" in line or "Program finished" in line:
+        return "exec"
+    if "WARN" in line or "Incomplete" in line:
+        return "warn"
+    if "ERROR" in line:
+        return "error"
+    return "info"
+
+
+def load_idf_env():
+    """Capture the environment export.sh sets up so idf.py can run directly.
+
+    Sourcing export.sh takes a few seconds, so the result is cached in
+    IDF_ENV_CACHE and reused until export.sh changes. Only the variables
+    that differ from our own environment are kept.
+    """
+    global _IDF_ENV
+    export_script = os.path.join(IDF_PATH, "export.sh")
+    try:
+        mtime = os.path.getmtime(export_script)
+    except OSError:
+        return
+    try:
+        with open(IDF_ENV_CACHE) as f:
+            cached = json.load(f)
+        if cached["export_sh"] == export_script and cached["mtime"] == mtime:
+            _IDF_ENV = cached["env"]
+            return
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    dump = "import json, os, sys; json.dump(dict(os.environ), sys.stdout)"
+    try:
+        out = subprocess.run(
+            ["bash", "-c", f'source "{export_script}" >/dev/null 2>&1 && python -c "{dump}"'],
+            capture_output=True, text=True, timeout=120,
+        )
+        env = json.loads(out.stdout) if out.returncode == 0 else None
+    except (OSError, ValueError, subprocess.SubprocessError):
+        env = None
+    if not isinstance(env, dict):
+        return
+    delta = {k: v for k, v in env.items()
+             if os.environ.get(k) != v and k not in ("_", "SHLVL", "PWD", "OLDPWD")}
+    try:
+        os.makedirs(os.path.dirname(IDF_ENV_CACHE), exist_ok=True)
+        with open(IDF_ENV_CACHE, "w") as f:
+            json.dump({"export_sh": export_script, "mtime": mtime, "env": delta}, f)
+    except OSError:
+        pass
+    _IDF_ENV = delta
+
 
 def detect_device_role(port):
     """Open a port briefly and read boot output to detect device role."""
@@ -85,12 +237,23 @@ def detect_device_role(port):
     return None
 
 
+# comports() walks sysfs/udev; share one result between callers for a second
+_PORT_CACHE = {"t": 0.0, "v": []}
+
+
+def _ports_cached(max_age=1.0):
+    now = time.monotonic()
+    if now - _PORT_CACHE["t"] > max_age:
+        _PORT_CACHE["v"] = [p.device for p in serial.tools.list_ports.comports()]
+        _PORT_CACHE["t"] = now
+    return _PORT_CACHE["v"]
+
+
 def detect_port(role=None):
     """Detect a serial port, optionally filtering by device role."""
-    candidates = [p.device for p in serial.tools.list_ports.comports()
-                  if "ACM" in p.device or "USB" in p.device]
+    ports = _ports_cached()
+    candidates = [p for p in ports if "ACM" in p or "USB" in p]
     if not candidates:
-        ports = [p.device for p in serial.tools.list_ports.comports()]
         return ports[0] if ports else None
     if role:
         for port in candidates:
@@ -100,14 +263,99 @@ def detect_port(role=None):
     return candidates[0]
 
 
+@contextlib.contextmanager
+def _writable(text):
+    """Make a read-only Text widget editable for the duration of the block.
+
+    Nested uses only toggle `state` at the outermost level, so a batch of
+    inserts costs one normal/disabled round trip.
+    """
+    depth = text.__dict__.get("_write_depth", 0)
+    if not depth:
+        text.configure(state="normal")
+    text._write_depth = depth + 1
+    try:
+        yield text
+    finally:
+        text._write_depth = depth
+        if not depth:
+            text.configure(state="disabled")
+
+
+def set_low_latency(ser):
+    """Ask the Linux tty driver to deliver serial input without batching.
+
+    Sets ASYNC_LOW_LATENCY through TIOCGSERIAL/TIOCSSERIAL; drivers that
+    don't support the ioctl get the FTDI latency_timer (default 16 ms)
+    dropped to 1 ms instead. Failures are ignored.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    import array
+    import fcntl
+    TIOCGSERIAL, TIOCSSERIAL, ASYNC_LOW_LATENCY = 0x541E, 0x541F, 0x2000
+    try:
+        buf = array.array("i", [0] * 32)
+        fcntl.ioctl(ser.fd, TIOCGSERIAL, buf)
+        buf[4] |= ASYNC_LOW_LATENCY  # serial_struct.flags
+        fcntl.ioctl(ser.fd, TIOCSSERIAL, buf)
+        return
+    except OSError:
+        pass
+    name = os.path.basename(ser.port)
+    try:
+        with open(f"/sys/bus/usb-serial/devices/{name}/latency_timer", "w") as f:
+            f.write("1")
+    except OSError:
+        pass
+
+
+class _PortWatcher:
+    """Re-enumerate serial ports every `interval` seconds off the Tk thread.
+
+    Subscribers are called on the Tk thread with the new device list
+    whenever it changes, so neither tab blocks on comports().
+    """
+
+    def __init__(self, root, interval=2.0):
+        self.root = root
+        self.interval = interval
+        self.subscribers = []
+        self._ports = None      # latest scan, written by the thread
+        self._delivered = None  # last list passed to subscribers
+        threading.Thread(target=self._scan_loop, daemon=True).start()
+        root.after(500, self._deliver)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def _scan_loop(self):
+        while True:
+            try:
+                self._ports = tuple(_ports_cached(max_age=0))
+            except Exception:
+                pass
+            time.sleep(self.interval)
+
+    def _deliver(self):
+        ports = self._ports
+        if ports is not None and ports != self._delivered:
+            self._delivered = ports
+            for callback in self.subscribers:
+                callback(list(ports))
+        self.root.after(500, self._deliver)
+
+
 class FlashTab:
     """Tab that builds and flashes the robo firmware."""
 
-    def __init__(self, parent, notebook, on_done):
+    def __init__(self, parent, notebook, on_done, port_watcher=None):
         self.frame = ttk.Frame(parent)
         self.notebook = notebook
         self.on_done = on_done
         self.process = None
+        if port_watcher:
+            port_watcher.subscribe(self._on_ports_changed)
 
         # Port selector
         port_frame = ttk.Frame(self.frame)
@@ -119,7 +367,8 @@ class FlashTab:
         self.port_combo.pack(side="left", padx=4)
         self._refresh_ports()
 
-        ttk.Button(port_frame, text="Refresh", command=self._refresh_ports).pack(side="left", padx=2)
+        ttk.Button(port_frame, text="Refresh",
+                   command=lambda: self._refresh_ports(force=True)).pack(side="left", padx=2)
         self.flash_btn = ttk.Button(port_frame, text="Flash", command=self.start_flash)
         self.flash_btn.pack(side="left", padx=4)
 
@@ -141,9 +390,14 @@ class FlashTab:
         self.text.tag_configure("error", foreground="#f44747")
         self.text.tag_configure("success", foreground="#6a9955")
         self.text.tag_configure("info", foreground="#569cd6")
+        self._line_count = 0
 
-    def _refresh_ports(self):
-        ports = [p.device for p in serial.tools.list_ports.comports()]
+        # ("log", text, tag) / ("done", returncode) from the flash thread
+        self._evq = queue.Queue()
+        self.frame.after(30, self._drain_queue)
+
+    def _refresh_ports(self, force=False):
+        ports = list(_ports_cached(0 if force else 1.0))
         self.port_combo["values"] = ports
         if self.port_var.get() not in ports:
             detected = detect_port("robo")
@@ -152,14 +406,30 @@ class FlashTab:
             elif ports:
                 self.port_var.set(ports[0])
 
+    def _on_ports_changed(self, ports):
+        # Called by _PortWatcher; picks a fallback port without probing
+        # devices, and leaves the selection alone while the port is in use
+        if tuple(ports) == tuple(self.port_combo["values"]):
+            return
+        self.port_combo["values"] = ports
+        if self.port_var.get() not in ports and str(self.port_combo["state"]) != "disabled":
+            candidates = [p for p in ports if "ACM" in p or "USB" in p] or ports
+            self.port_var.set(candidates[0] if candidates else "")
+
     def _append_text(self, text, tag=None):
-        self.text.configure(state="normal")
-        if tag:
-            self.text.insert("end", text, tag)
-        else:
-            self.text.insert("end", text)
-        self.text.see("end")
-        self.text.configure(state="disabled")
+        with _writable(self.text):
+            if tag:
+                self.text.insert("end", text, tag)
+            else:
+                self.text.insert("end", text)
+            # Same cap as the serial log; the trim index is only formatted
+            # when a trim actually happens
+            self._line_count += text.count("\n")
+            if self._line_count > LOG_MAX_LINES:
+                excess = self._line_count - LOG_KEEP_LINES
+                self.text.delete("1.0", f"{excess + 1}.0")
+                self._line_count = LOG_KEEP_LINES
+            self.text.see("end")
 
     def start_flash(self):
         port = self.port_var.get()
@@ -169,35 +439,71 @@ class FlashTab:
 
         self.flash_btn.configure(state="disabled")
         self.port_combo.configure(state="disabled")
-        self.text.configure(state="normal")
-        self.text.delete("1.0", "end")
-        self.text.configure(state="disabled")
-
         self.status_label.configure(text="Building & flashing...", foreground="blue")
-        self._append_text(f">>> Building and flashing robo firmware to {port}...\n\n", "info")
+        with _writable(self.text):
+            self.text.delete("1.0", "end")
+            self._line_count = 0
+            self._append_text(f">>> Building and flashing robo firmware to {port}...\n\n", "info")
 
         def run_flash():
-            export_script = os.path.join(IDF_PATH, "export.sh")
-            cmd = f'source "{export_script}" && cd "{ROBO_PROJECT_DIR}" && idf.py -p {port} build flash'
+            idf_env = _IDF_ENV
+            if idf_env is not None:
+                # Environment already captured: run idf.py directly
+                args = ["idf.py", "-p", port, "build", "flash"]
+                env = {**os.environ, **idf_env}
+            else:
+                export_script = os.path.join(IDF_PATH, "export.sh")
+                cmd = f'source "{export_script}" && cd "{ROBO_PROJECT_DIR}" && idf.py -p {port} build flash'
+                args, env = ["bash", "-c", cmd], None
             try:
                 proc = subprocess.Popen(
-                    ["bash", "-c", cmd],
+                    args,
+                    cwd=ROBO_PROJECT_DIR,
+                    env=env,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
+                    bufsize=65536,
                 )
                 self.process = proc
-                for line in proc.stdout:
-                    self.frame.after(0, self._append_text, line)
+                # Queue output as read1() returns it; _drain_queue merges
+                # whatever arrived since its last tick into one insert
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                for chunk in iter(lambda: proc.stdout.read1(65536), b""):
+                    self._evq.put(("log", decoder.decode(chunk), None))
+                # Flush a multi-byte sequence cut off at EOF as U+FFFD
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    self._evq.put(("log", tail, None))
                 proc.wait()
-                self.frame.after(0, self._on_flash_done, proc.returncode)
+                self._evq.put(("done", proc.returncode))
             except Exception as e:
-                self.frame.after(0, self._append_text, f"\nError: {e}\n", "error")
-                self.frame.after(0, self._on_flash_done, 1)
+                self._evq.put(("log", f"\nError: {e}\n", "error"))
+                self._evq.put(("done", 1))
 
         threading.Thread(target=run_flash, daemon=True).start()
 
+    def _drain_queue(self):
+        pending, pending_tag = [], None
+        for _ in range(256):
+            try:
+                event = self._evq.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "log" and (not pending or event[2] == pending_tag):
+                pending.append(event[1])
+                pending_tag = event[2]
+                continue
+            if pending:
+                self._append_text("".join(pending), pending_tag)
+                pending = []
+            if event[0] == "log":
+                pending, pending_tag = [event[1]], event[2]
+            else:
+                self._on_flash_done(event[1])
+        if pending:
+            self._append_text("".join(pending), pending_tag)
+        self.frame.after(30, self._drain_queue)
+
     def _on_flash_done(self, returncode):
         self.process = None
         self.flash_btn.configure(state="normal")
@@ -215,11 +521,13 @@ class FlashTab:
 class MonitorTab:
     """Tab that monitors serial output and visualizes received programs."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, port_watcher=None):
         self.frame = ttk.Frame(parent)
         self.serial_thread = None
         self.ser = None
         self.running = False
+        if port_watcher:
+            port_watcher.subscribe(self._on_ports_changed)
 
         # Top bar
         top = ttk.Frame(self.frame)
@@ -231,7 +539,8 @@ class MonitorTab:
         self.port_combo.pack(side="left", padx=4)
         self._refresh_ports()
 
-        ttk.Button(top, text="Refresh", command=self._refresh_ports).pack(side="left", padx=2)
+        ttk.Button(top, text="Refresh",
+                   command=lambda: self._refresh_ports(force=True)).pack(side="left", padx=2)
         self.connect_btn = ttk.Button(top, text="Connect", command=self._toggle_connect)
         self.connect_btn.pack(side="left", padx=4)
 
@@ -249,7 +558,14 @@ class MonitorTab:
         paned.add(viz_frame, weight=1)
 
         self.block_canvas = tk.Canvas(viz_frame, bg="#2d2d2d", height=120, highlightthickness=0)
+        # Named fonts for block labels, so canvas items share one font
+        # and label widths are measured once per block
+        self._blk_font = tkfont.Font(family="", size=8, weight="bold")
+        self._num_font = tkfont.Font(family="", size=7)
         self.block_canvas.pack(fill="both", expand=True, padx=4, pady=4)
+        self.block_canvas.bind("<Configure>", self._on_canvas_resize)
+        # Canvas width, updated from <Configure> so drawing never queries Tk
+        self._canvas_w = 500
 
         # Execution status
         status_row = ttk.Frame(viz_frame)
@@ -279,8 +595,36 @@ class MonitorTab:
         self.received_blocks = []
         self.current_exec_index = -1
 
-    def _refresh_ports(self):
-        ports = [p.device for p in serial.tools.list_ports.comports()]
+        # Canvas item ids per received block; see _rebuild_blocks
+        self._block_items = []
+        self._block_geom = None
+        self._hl = None
+        self._hl_index = -1
+        self._redraw_pending = False
+        self._rebuild_pending = False
+        # While the tab is hidden, log text and canvas updates are held
+        # back and applied when it is shown again (see set_visible)
+        self._visible = True
+
+        self._line_handlers = {
+            "pstart": self._handle_program_start,
+            "rblock": self._handle_received_block,
+            "pend": self._handle_program_end,
+            "exec": self._handle_exec_step,
+            "pfin": self._handle_program_finished,
+        }
+
+        # ("lines", [(line, tag, kind, value), ...]) / ("disconnect", None)
+        # from the reader thread, drained on the Tk thread every 30 ms.
+        # Log text is grouped into ([lines], tag) runs and inserted once
+        # per drain; _log_lines tracks the widget's line count.
+        self._evq = queue.Queue()
+        self._log_chunks = []
+        self._log_lines = 0
+        self.frame.after(30, self._drain_queue)
+
+    def _refresh_ports(self, force=False):
+        ports = list(_ports_cached(0 if force else 1.0))
         self.port_combo["values"] = ports
         if self.port_var.get() not in ports:
             detected = detect_port("robo")
@@ -289,6 +633,16 @@ class MonitorTab:
             elif ports:
                 self.port_var.set(ports[0])
 
+    def _on_ports_changed(self, ports):
+        # Called by _PortWatcher; picks a fallback port without probing
+        # devices, and leaves the selection alone while the port is in use
+        if tuple(ports) == tuple(self.port_combo["values"]):
+            return
+        self.port_combo["values"] = ports
+        if self.port_var.get() not in ports and str(self.port_combo["state"]) != "disabled":
+            candidates = [p for p in ports if "ACM" in p or "USB" in p] or ports
+            self.port_var.set(candidates[0] if candidates else "")
+
     def auto_connect(self, port):
         self.port_var.set(port)
         self.frame.after(1500, self._do_connect)
@@ -307,12 +661,20 @@ class MonitorTab:
 
         try:
             self.ser = serial.Serial(port, 115200, timeout=0.5)
+            set_low_latency(self.ser)
             time.sleep(0.1)
             self.ser.reset_input_buffer()
         except Exception as e:
             messagebox.showerror("Error", f"Could not open {port}: {e}")
             return
 
+        # selectors can't wait on Windows serial handles; the reader falls
+        # back to pyserial's read() there
+        self._sel = None
+        if sys.platform != "win32":
+            self._sel = selectors.DefaultSelector()
+            self._sel.register(self.ser.fd, selectors.EVENT_READ)
+
         self.running = True
         self.connect_btn.configure(text="Disconnect")
         self.conn_label.configure(text=f"Connected: {port}", foreground="green")
@@ -331,146 +693,245 @@ class MonitorTab:
         self.port_combo.configure(state="readonly")
 
     def _serial_reader(self):
-        while self.running and self.ser and self.ser.is_open:
+        # Read whatever is buffered in one call and hand complete lines to
+        # the Tk thread as a single batch. On POSIX the thread waits on the
+        # port fd and reads it directly, bypassing pyserial's read loop.
+        ser, sel = self.ser, self._sel
+        # The incremental decoder keeps multi-byte characters split across
+        # reads intact; tail holds the unterminated last line
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        tail = ""
+        while self.running and ser.is_open:
             try:
-                raw = self.ser.readline()
-                if raw:
-                    line = raw.decode(errors="replace").rstrip()
-                    if line:
-                        self.frame.after(0, self._process_line, line)
+                if sel is None:
+                    raw = ser.read(ser.in_waiting or 1)
+                elif not sel.select(0.1):
+                    continue
+                else:
+                    raw = os.read(ser.fd, 8192)
+                    if not raw:
+                        raise serial.SerialException("device disconnected")
             except Exception:
                 if self.running:
-                    self.frame.after(0, self._disconnect)
+                    self._evq.put(("disconnect", None))
                 break
+            tail += decoder.decode(raw)
+            if "\n" not in tail:
+                continue
+            *lines, tail = tail.split("\n")
+            # Tag and parse here so the Tk thread only inserts and dispatches
+            records = []
+            for line in lines:
+                line = line.rstrip()
+                if line:
+                    kind, value = _parse_event(line)
+                    records.append((line, _EVENT_TAGS.get(kind) or _line_tag(line), kind, value))
+            if records:
+                self._evq.put(("lines", records))
+        if sel is not None:
+            sel.close()
+
+    def _drain_queue(self):
+        for _ in range(256):
+            try:
+                kind, payload = self._evq.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "lines":
+                for record in payload:
+                    self._process_line(*record)
+            elif kind == "disconnect" and self.running:
+                self._disconnect()
+        if self._log_chunks:
+            if self._visible:
+                self._append_log(self._log_chunks)
+                self._log_chunks = []
+            else:
+                self._trim_pending_log()
+        self.frame.after(30, self._drain_queue)
+
+    def _trim_pending_log(self):
+        # Held-back output beyond what the widget would keep is dropped
+        chunks = self._log_chunks
+        total = sum(len(lines) for lines, _ in chunks)
+        while total > LOG_MAX_LINES:
+            lines = chunks[0][0]
+            drop = min(len(lines), total - LOG_KEEP_LINES)
+            del lines[:drop]
+            total -= drop
+            if not lines:
+                chunks.pop(0)
+
+    def set_visible(self, visible):
+        """Called when the notebook shows or hides this tab."""
+        self._visible = visible
+        if visible:
+            if self._log_chunks:
+                self._append_log(self._log_chunks)
+                self._log_chunks = []
+            self._schedule_redraw()
+
+    def _process_line(self, line, tag, kind, value):
+        # line arrives already tagged and parsed by _serial_reader
+        chunks = self._log_chunks
+        if chunks and chunks[-1][1] == tag:
+            chunks[-1][0].append(line)
+        else:
+            chunks.append(([line], tag))
+
+        # Dispatch ESP-NOW receive and executor events
+        if kind:
+            self._line_handlers[kind](value)
 
-    def _process_line(self, line):
-        # Determine tag based on content
-        tag = "info"
-        if "Program start" in line or "Received block" in line:
-            tag = "recv"
-        elif "Executing" in line or "Forward" in line or "Backward" in line or \
-             "Turn" in line or "Shake" in line or "Spin" in line or "Beep" in line or \
-             "Eyes:" in line or "Program END" in line or "Program finished" in line:
-            tag = "exec"
-        elif "WARN" in line or "Incomplete" in line:
-            tag = "warn"
-        elif "ERROR" in line:
-            tag = "error"
-
-        self._append_log(line + "\n", tag)
-
-        # Parse ESP-NOW receive events
+    def _handle_program_start(self, count):
         # "Program start: expecting N blocks"
-        m = re.search(r"Program start: expecting (\d+) block", line)
-        if m:
-            self.received_blocks = []
-            self.current_exec_index = -1
-            self.exec_label.configure(text=f"Receiving {m.group(1)} blocks...")
-            self._draw_blocks()
-            return
+        self.received_blocks = []
+        self.current_exec_index = -1
+        self.exec_label.configure(text=f"Receiving {count} blocks...")
+        self._schedule_redraw(rebuild=True)
 
+    def _handle_received_block(self, block):
         # "Received block N: type=0xXX name=..."
-        m = re.search(r"Received block (\d+): type=0x([0-9A-Fa-f]+)\s+name=(\S*)", line)
-        if m:
-            idx = int(m.group(1))
-            type_id = int(m.group(2), 16)
-            name = m.group(3)
-            block_name = BLOCK_NAMES.get(type_id, f"0x{type_id:02X}")
-            self.received_blocks.append({"index": idx, "type": type_id, "name": block_name, "label": name})
-            self.exec_label.configure(text=f"Received {len(self.received_blocks)} block(s)...")
-            self._draw_blocks()
-            return
-
-        # "Program end"
-        if "Program end" in line:
-            self.exec_label.configure(text=f"Program received ({len(self.received_blocks)} blocks) - executing...")
-            self._draw_blocks()
-            return
-
+        idx, type_id, name = block
+        block_name = _NAME_TABLE[type_id]
+        display = block_name if len(block_name) <= 10 else block_name[:9] + ".."
+        self.received_blocks.append({"index": idx, "type": type_id, "name": block_name, "label": name,
+                                     "_display": display, "_w": self._blk_font.measure(display)})
+        self.exec_label.configure(text=f"Received {len(self.received_blocks)} block(s)...")
+        self._schedule_redraw(rebuild=True)
+
+    def _handle_program_end(self, _):
+        self.exec_label.configure(text=f"Program received ({len(self.received_blocks)} blocks) - executing...")
+
+    def _handle_exec_step(self, index):
         # Executor lines: "[N] type=0xXX"
-        m = re.search(r"\[(\d+)\] type=0x", line)
-        if m:
-            self.current_exec_index = int(m.group(1))
-            self._draw_blocks()
-            return
+        self.current_exec_index = index
+        self._schedule_redraw()
 
-        # Execution complete
-        if "Program finished" in line or "Program END" in line:
-            self.current_exec_index = -1
-            self.exec_label.configure(text="Execution complete - waiting for next program...")
-            self._draw_blocks()
+    def _handle_program_finished(self, _):
+        self.current_exec_index = -1
+        self.exec_label.configure(text="Execution complete - waiting for next program...")
+        self._schedule_redraw()
+
+    def _on_canvas_resize(self, event):
+        if event.width != self._canvas_w:
+            self._canvas_w = event.width
+            self._schedule_redraw(rebuild=True)
+
+    def _schedule_redraw(self, rebuild=False):
+        """Coalesce canvas updates into one idle callback.
+
+        rebuild=True recreates the block items (the block list changed);
+        otherwise only the execution highlight is moved.
+        """
+        self._rebuild_pending |= rebuild
+        if not self._redraw_pending and self._visible:
+            self._redraw_pending = True
+            self.frame.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        if self._rebuild_pending:
+            self._rebuild_pending = False
+            self._rebuild_blocks()
+        else:
+            self._update_highlight()
 
-    def _draw_blocks(self):
+    def _rebuild_blocks(self):
         c = self.block_canvas
         c.delete("all")
+        self._block_items = []
+        self._hl_index = -1
+        self._hl = None
 
+        w = self._canvas_w
         if not self.received_blocks:
-            c.create_text(c.winfo_width() // 2 or 200, 60,
+            c.create_text(w // 2, 60,
                           text="No program received yet", fill="#666", font=("", 12))
             return
 
         n = len(self.received_blocks)
         pad = 10
-        available = (c.winfo_width() or 500) - 2 * pad
+        available = w - 2 * pad
         block_w = min(80, max(40, available // n - 8))
         block_h = 70
         total_w = n * (block_w + 8) - 8
-        start_x = max(pad, ((c.winfo_width() or 500) - total_w) // 2)
+        start_x = max(pad, (w - total_w) // 2)
         y = 25
+        self._block_geom = (block_w, block_h, start_x, y)
 
         for i, blk in enumerate(self.received_blocks):
             x = start_x + i * (block_w + 8)
             name = blk["name"]
-            color = BLOCK_COLORS.get(name, "#607D8B")
-
-            # Highlight currently executing block
-            if i == self.current_exec_index:
-                c.create_rectangle(x - 3, y - 3, x + block_w + 3, y + block_h + 3,
-                                   outline="#FFD700", width=3)
+            color = _COLOR_TABLE[blk["type"]]
+            items = {}
 
-            c.create_rectangle(x, y, x + block_w, y + block_h,
-                               fill=color, outline="#fff", width=1)
+            items["rect"] = c.create_rectangle(x, y, x + block_w, y + block_h,
+                                               fill=color, outline="#fff", width=1)
 
-            # Block name (truncate if needed)
-            display = name if len(name) <= 10 else name[:9] + ".."
+            # Block name, truncated and measured when it was received; only
+            # labels wider than the card need Tk to wrap them
             # Pick text color based on background brightness
             text_color = "#000" if name in ("WHITE_LIGHT_ON",) else "#fff"
-            c.create_text(x + block_w // 2, y + block_h // 2,
-                          text=display, fill=text_color, font=("", 8, "bold"),
-                          width=block_w - 4)
-            c.create_text(x + block_w // 2, y + block_h + 10,
-                          text=f"#{i}", fill="#888", font=("", 7))
+            items["text"] = c.create_text(x + block_w // 2, y + block_h // 2,
+                                          text=blk["_display"], fill=text_color, font=self._blk_font,
+                                          width=block_w - 4 if blk["_w"] > block_w - 4 else 0)
+            items["num"] = c.create_text(x + block_w // 2, y + block_h + 10,
+                                         text=f"#{i}", fill="#888", font=self._num_font)
 
             # Arrow between blocks
             if i < n - 1:
                 ax = x + block_w + 1
-                c.create_line(ax, y + block_h // 2, ax + 6, y + block_h // 2,
-                              fill="#888", arrow="last", width=1)
-
-    def _append_log(self, text, tag=None):
-        self.log_text.configure(state="normal")
-        if tag:
-            self.log_text.insert("end", text, tag)
+                items["arrow"] = c.create_line(ax, y + block_h // 2, ax + 6, y + block_h // 2,
+                                               fill="#888", arrow="last", width=1)
+            self._block_items.append(items)
+
+        # One highlight for the executing block, moved by _update_highlight
+        self._hl = c.create_rectangle(0, 0, 0, 0, outline="#FFD700", width=3, state="hidden")
+        self._update_highlight()
+
+    def _update_highlight(self):
+        """Move the highlight onto current_exec_index, or hide it."""
+        i = self.current_exec_index
+        if i == self._hl_index or self._hl is None:
+            return
+        c = self.block_canvas
+        if 0 <= i < len(self._block_items):
+            block_w, block_h, start_x, y = self._block_geom
+            x = start_x + i * (block_w + 8)
+            c.coords(self._hl, x - 3, y - 3, x + block_w + 3, y + block_h + 3)
+            c.itemconfigure(self._hl, state="normal")
+            c.tag_raise(self._hl)
         else:
-            self.log_text.insert("end", text)
-        # Keep log from growing too large
-        lines = int(self.log_text.index("end-1c").split(".")[0])
-        if lines > 2000:
-            self.log_text.delete("1.0", f"{lines - 1500}.0")
-        self.log_text.see("end")
-        self.log_text.configure(state="disabled")
+            c.itemconfigure(self._hl, state="hidden")
+        self._hl_index = i
+
+    def _append_log(self, chunks):
+        """Insert ([lines], tag) runs, one insert per run."""
+        with _writable(self.log_text):
+            for lines, tag in chunks:
+                self.log_text.insert("end", "\n".join(lines) + "\n", tag)
+                self._log_lines += len(lines)
+            # Keep log from growing too large
+            if self._log_lines > LOG_MAX_LINES:
+                excess = self._log_lines - LOG_KEEP_LINES
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self._log_lines = LOG_KEEP_LINES
+            self.log_text.see("end")
 
     def _clear_all(self):
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", "end")
-        self.log_text.configure(state="disabled")
+        with _writable(self.log_text):
+            self.log_text.delete("1.0", "end")
+        self._log_lines = 0
         self.received_blocks = []
         self.current_exec_index = -1
         self.exec_label.configure(text="Waiting for program...")
-        self._draw_blocks()
+        self._schedule_redraw(rebuild=True)
 
 
 def main():
+    threading.Thread(target=load_idf_env, daemon=True).start()
+
     root = tk.Tk(className="Bloco Robot Simulator")
     root.title("Bloco Robot Simulator")
     icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")
@@ -497,7 +958,8 @@ def main():
     notebook.pack(fill="both", expand=True)
 
     # Monitor tab (created first so flash can reference it)
-    monitor_tab = MonitorTab(root)
+    port_watcher = _PortWatcher(root)
+    monitor_tab = MonitorTab(root, port_watcher)
     notebook.add(monitor_tab.frame, text="  Monitor  ")
 
     def on_flash_done(port):
@@ -505,10 +967,14 @@ def main():
         monitor_tab.auto_connect(port)
 
     # Flash tab
-    flash_tab = FlashTab(root, notebook, on_flash_done)
+    flash_tab = FlashTab(root, notebook, on_flash_done, port_watcher)
     notebook.insert(0, flash_tab.frame, text="  Flash  ")
     notebook.select(flash_tab.frame)
 
+    # The monitor only renders while its tab is showing
+    notebook.bind("<<NotebookTabChanged>>",
+                  lambda e: monitor_tab.set_visible(notebook.select() == str(monitor_tab.frame)))
+
     root.mainloop()
 
 
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Bloco Launchpad — GUI development launcher for the Bloco project."""
 
-import glob
+import collections
+import heapq
+import itertools
 import os
-import subprocess
 import sys
-import threading
 import time
 import tkinter as tk
 from tkinter import ttk
@@ -17,6 +17,11 @@ IDF_PATH = os.environ.get(
     "IDF_PATH",
     os.path.expanduser("~/.espressif/v5.5.2/esp-idf"),
 )
+EXPORT_SCRIPT = os.path.join(IDF_PATH, "export.sh")
+PROJECT_DIRS = {p: os.path.join(PROJECT_ROOT, p) for p in ("board", "robo", "block")}
+BOARD_GUI = os.path.join(PROJECT_DIRS["board"], "tools", "board_monitor.py")
+ROBO_GUI = os.path.join(PROJECT_DIRS["robo"], "tools", "robo_sim.py")
+BLOCK_GUI = os.path.join(PROJECT_DIRS["block"], "tools", "block_gui.py")
 
 # --- Theme ---
 BG = "#1a1a2e"
@@ -30,19 +35,88 @@ RED = "#ef476f"
 YELLOW = "#ffd166"
 BLUE = "#118ab2"
 
+# Step 4 output keeps only the newest lines so Tk's layout cost stays bounded
+OUTPUT_MAX_LINES = 5000
+
 
 def detect_ports():
-    return sorted(glob.glob("/dev/ttyACM*") + glob.glob("/dev/ttyUSB*"))
+    # One pass over /dev instead of a glob per pattern
+    try:
+        with os.scandir("/dev") as it:
+            return sorted("/dev/" + e.name for e in it
+                          if e.name.startswith(("ttyACM", "ttyUSB")))
+    except FileNotFoundError:
+        return []
+
+
+def _cfg_if_changed(widget, **kw):
+    """widget.config(**kw), skipping options already set to the same value."""
+    last = widget.__dict__.setdefault("_last_kw", {})
+    changed = {k: v for k, v in kw.items() if last.get(k) != v}
+    if changed:
+        widget.config(**changed)
+        last.update(changed)
+
+
+def _spawn(argv):
+    """Start argv in the background with stdout/stderr discarded.
+
+    Uses posix_spawnp where available so the launcher's address space isn't
+    forked for each tool; raises FileNotFoundError if argv[0] isn't found.
+    """
+    if not hasattr(os, "posix_spawnp"):
+        import subprocess
+        subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    import threading
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        pid = os.posix_spawnp(argv[0], argv, os.environ,
+                              file_actions=[(os.POSIX_SPAWN_DUP2, devnull, 1),
+                                            (os.POSIX_SPAWN_DUP2, devnull, 2)])
+    finally:
+        os.close(devnull)
+    # Reap the child when it exits so it doesn't linger as a zombie
+    threading.Thread(target=os.waitpid, args=(pid, 0), daemon=True).start()
+
+
+# Decoded once and shared by the window icon and the title bar
+_ICON_CACHE = None
+
+
+def _load_icon():
+    """Return the launcher icon as a PhotoImage, or None if it's missing.
+
+    On Windows an icon.gif next to icon.png is preferred, as Tk decodes
+    GIF faster than PNG there.
+    """
+    global _ICON_CACHE
+    if _ICON_CACHE is None:
+        names = ("icon.gif", "icon.png") if sys.platform.startswith("win") else ("icon.png",)
+        for name in names:
+            icon_path = os.path.join(SCRIPT_DIR, name)
+            if os.path.exists(icon_path):
+                _ICON_CACHE = tk.PhotoImage(file=icon_path)
+                break
+    return _ICON_CACHE
 
 
 def _set_icon(root):
-    icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")
-    if os.path.exists(icon_path):
-        root._icon_img = tk.PhotoImage(file=icon_path)
-        root.iconphoto(True, root._icon_img)
+    icon = _load_icon()
+    if icon is not None:
+        root.iconphoto(True, icon)
 
 
 class Launchpad(tk.Tk):
+    # Shared widget styling, built once for the class
+    CARD_OPTS = dict(bg=BG_CARD, padx=16, pady=12, highlightbackground=BG_INPUT,
+                     highlightthickness=1)
+    BTN_OPTS = dict(font=("Helvetica", 11, "bold"), fg="#fff", activeforeground="#fff",
+                    relief="flat", cursor="hand2", padx=16, pady=8)
+    # Step 4 option checkboxes
+    CHECK_OPTS = dict(font=("Helvetica", 10), fg=FG, bg=BG_CARD, selectcolor=BG_INPUT,
+                      activebackground=BG_CARD, activeforeground=FG, cursor="hand2")
+
     def __init__(self):
         super().__init__(className="Bloco Launchpad")
         self.title("Bloco Launchpad")
@@ -55,14 +129,35 @@ class Launchpad(tk.Tk):
         self.second_port = None
         self.mode = None  # "robo", "block", "board_only"
 
+        # One 50 ms Tk timer runs every deferred callback (_schedule) and
+        # drains the Step 4 log onto the Text widget
+        self._due = []
+        self._due_seq = itertools.count()
+        self._incoming = collections.deque()
+        self._log_q = collections.deque()
+        self.after(50, self._tick)
+        # _tick also stamps a heartbeat; a watchdog thread reports on stderr
+        # when the Tk loop stops pumping for more than half a second. It starts
+        # a second into mainloop so the initial window mapping isn't reported
+        self._heartbeat = time.monotonic()
+        self._schedule(1000, self._start_watchdog)
+
+        # Port lists are rescanned when a dropdown opens, when the window
+        # gains focus, and on udev hot-plug events. Without udev, _poll_ports
+        # rescans instead, backing off from 200 ms to 2 s while nothing changes
+        self._poll_interval_ms = 200
+        self._udev_watch = self._start_udev_watch()
+        if not self._udev_watch:
+            self._schedule(self._poll_interval_ms, self._poll_ports)
+        self.bind("<FocusIn>", lambda e: self._refresh_active_ports())
+
         # Title bar with icon
         title_frame = tk.Frame(self, bg=BG)
         title_frame.pack(fill="x", padx=20, pady=(20, 0))
 
-        icon_path = os.path.join(SCRIPT_DIR, "icon.png")
-        if os.path.exists(icon_path):
-            self._title_icon = tk.PhotoImage(file=icon_path)
-            tk.Label(title_frame, image=self._title_icon, bg=BG).pack(side="left", padx=(0, 12))
+        icon = _load_icon()
+        if icon is not None:
+            tk.Label(title_frame, image=icon, bg=BG).pack(side="left", padx=(0, 12))
 
         tk.Label(title_frame, text="BLOCO", font=("Helvetica", 28, "bold"),
                  fg=ACCENT, bg=BG).pack(side="left")
@@ -75,47 +170,115 @@ class Launchpad(tk.Tk):
         # Separator
         tk.Frame(self, bg=ACCENT, height=2).pack(fill="x", padx=20, pady=(10, 0))
 
-        # Main content area — holds wizard steps
-        self.content = tk.Frame(self, bg=BG)
+        # Main content area — the four wizard steps are built once, stacked
+        # in the same cell, and switched with tkraise()
+        self.content = tk.Frame(self, bg=BG, width=660, height=460)
+        self.content.grid_propagate(False)
+        self.content.rowconfigure(0, weight=1)
+        self.content.columnconfigure(0, weight=1)
         self.content.pack(fill="both", expand=True, padx=20, pady=10)
+        self.steps = {}
+        for n in (1, 2, 3, 4):
+            self.steps[n] = tk.Frame(self.content, bg=BG)
+            self.steps[n].grid(row=0, column=0, sticky="nsew")
 
         # Status bar
         self.status_var = tk.StringVar(value="Welcome")
         status_bar = tk.Label(self, textvariable=self.status_var, font=("Helvetica", 9),
                               fg=FG_DIM, bg=BG_CARD, anchor="w", padx=10, pady=4)
         status_bar.pack(fill="x", side="bottom")
+        # Status text is applied at most every 100 ms; the latest one wins
+        self._status_pending = None
+        self.after(100, self._flush_status)
 
         # Start wizard
+        self._build_step1()
+        self._build_step2()
+        self._build_step3()
+        self._build_step4()
         self._show_step1()
 
-    def _clear_content(self):
-        for w in self.content.winfo_children():
-            w.destroy()
-
-    def _make_card(self, parent, title):
-        card = tk.Frame(parent, bg=BG_CARD, padx=16, pady=12, highlightbackground=BG_INPUT,
-                        highlightthickness=1)
+    def _set_status(self, text):
+        """Set the status bar text on the next flush; safe from any thread."""
+        self._status_pending = text
+
+    def _flush_status(self):
+        text, self._status_pending = self._status_pending, None
+        if text is not None:
+            self.status_var.set(text)
+        self.after(100, self._flush_status)
+
+    def _schedule(self, ms, fn, *args):
+        """Run fn(*args) on the Tk thread after ms; safe from any thread."""
+        self._incoming.append((time.monotonic() + ms / 1000, fn, args))
+
+    def _tick(self):
+        # Re-arm first so a failing callback doesn't stop the loop
+        self.after(50, self._tick)
+        self._heartbeat = time.monotonic()
+        while self._incoming:
+            deadline, fn, args = self._incoming.popleft()
+            heapq.heappush(self._due, (deadline, next(self._due_seq), fn, args))
+        now = time.monotonic()
+        while self._due and self._due[0][0] <= now:
+            _, _, fn, args = heapq.heappop(self._due)
+            fn(*args)
+        self._drain_log()
+
+    def _start_watchdog(self):
+        import threading
+
+        def watch():
+            # One line per stall, written once the heartbeat resumes
+            stalled_since = None
+            while True:
+                time.sleep(0.1)
+                beat = self._heartbeat
+                if stalled_since is None:
+                    if time.monotonic() - beat > 0.5:
+                        stalled_since = beat
+                elif beat != stalled_since:
+                    print(f"[launchpad] main thread stalled {beat - stalled_since:.2f}s",
+                          file=sys.stderr)
+                    stalled_since = None
+
+        threading.Thread(target=watch, daemon=True).start()
+
+    def _make_card(self, parent, title="", textvariable=None):
+        card = tk.Frame(parent, **self.CARD_OPTS)
         card.pack(fill="x", pady=(0, 10))
-        tk.Label(card, text=title, font=("Helvetica", 13, "bold"),
+        tk.Label(card, text=title, textvariable=textvariable, font=("Helvetica", 13, "bold"),
                  fg=ACCENT, bg=BG_CARD, anchor="w").pack(fill="x")
         tk.Frame(card, bg=BG_INPUT, height=1).pack(fill="x", pady=(4, 8))
         return card
 
+    def _make_section(self, parent, title, rows):
+        """Section heading plus one checkbutton per (text, var) row.
+
+        text may be a StringVar for labels that change between visits.
+        Returns the checkbuttons in row order.
+        """
+        tk.Label(parent, text=title, font=("Helvetica", 11, "bold"),
+                 fg=FG, bg=BG_CARD).pack(anchor="w", pady=(0, 4))
+        buttons = []
+        for text, var in rows:
+            label = {"textvariable": text} if isinstance(text, tk.Variable) else {"text": text}
+            cb = tk.Checkbutton(parent, variable=var, **label, **self.CHECK_OPTS)
+            cb.pack(anchor="w")
+            buttons.append(cb)
+        return buttons
+
     def _make_button(self, parent, text, command, color=ACCENT, width=18):
-        btn = tk.Button(parent, text=text, command=command, font=("Helvetica", 11, "bold"),
-                        bg=color, fg="#fff", activebackground=color, activeforeground="#fff",
-                        relief="flat", cursor="hand2", padx=16, pady=8, width=width)
-        return btn
+        return tk.Button(parent, text=text, command=command, bg=color, activebackground=color,
+                         width=width, **self.BTN_OPTS)
 
     # ── Step 1: Connect Board ──
 
-    def _show_step1(self):
-        self._clear_content()
-        self.status_var.set("Step 1 of 4 — Connect Board")
-
-        tk.Label(self.content, text="STEP 1", font=("Helvetica", 10, "bold"),
+    def _build_step1(self):
+        page = self.steps[1]
+        tk.Label(page, text="STEP 1", font=("Helvetica", 10, "bold"),
                  fg=YELLOW, bg=BG).pack(anchor="w")
-        card = self._make_card(self.content, "Connect the Board ESP32-S3")
+        card = self._make_card(page, "Connect the Board ESP32-S3")
 
         tk.Label(card, text="This is the main board with the EEPROM reader + I2C mux.\n"
                             "Plug it in via USB.",
@@ -130,10 +293,12 @@ class Launchpad(tk.Tk):
 
         self.board_port_var = tk.StringVar()
         self.board_port_combo = ttk.Combobox(detect_frame, textvariable=self.board_port_var,
-                                             width=20, state="readonly")
+                                             width=20, state="readonly",
+                                             postcommand=self._refresh_board_ports)
         self.board_port_combo.pack(side="left", padx=8)
 
-        refresh_btn = tk.Button(detect_frame, text="Refresh", command=self._refresh_board_ports,
+        refresh_btn = tk.Button(detect_frame, text="Refresh",
+                                command=lambda: self._refresh_board_ports(force=True),
                                 font=("Helvetica", 9), bg=BG_INPUT, fg=FG, relief="flat",
                                 cursor="hand2", padx=8)
         refresh_btn.pack(side="left")
@@ -142,54 +307,51 @@ class Launchpad(tk.Tk):
                                            fg=FG_DIM, bg=BG_CARD)
         self.board_detect_label.pack(side="left", padx=10)
 
-        self._refresh_board_ports()
-
-        # Auto-detect polling
-        self.board_poll_active = True
-        self._poll_board_port()
-
         # Next button
-        btn_frame = tk.Frame(self.content, bg=BG)
+        btn_frame = tk.Frame(page, bg=BG)
         btn_frame.pack(fill="x", pady=(10, 0))
         self._make_button(btn_frame, "Next  >>", self._step1_next).pack(side="right")
 
-    def _refresh_board_ports(self):
-        ports = detect_ports()
+    def _show_step1(self):
+        self._set_status("Step 1 of 4 — Connect Board")
+        _cfg_if_changed(self.board_detect_label, text="", fg=FG_DIM)
+        self._last_board_ports = None
+        self._refresh_board_ports()
+        self.board_detect_active = True
+        self._poll_interval_ms = 200
+        self.steps[1].tkraise()
+
+    def _refresh_board_ports(self, force=False):
+        """Rescan ports for this step; returns True if the list changed."""
+        ports = tuple(detect_ports())
+        if ports == self._last_board_ports and not force:
+            return False
+        self._last_board_ports = ports
         self.board_port_combo["values"] = ports
         if ports and not self.board_port_var.get():
             self.board_port_var.set(ports[0])
-            self.board_detect_label.config(text="Detected!", fg=GREEN)
+            _cfg_if_changed(self.board_detect_label, text="Detected!", fg=GREEN)
         elif not ports:
-            self.board_detect_label.config(text="No device found — plug in the board", fg=YELLOW)
-
-    def _poll_board_port(self):
-        if not hasattr(self, 'board_poll_active') or not self.board_poll_active:
-            return
-        ports = detect_ports()
-        self.board_port_combo["values"] = ports
-        if ports and not self.board_port_var.get():
-            self.board_port_var.set(ports[0])
-            self.board_detect_label.config(text="Detected!", fg=GREEN)
-        self.after(1000, self._poll_board_port)
+            _cfg_if_changed(self.board_detect_label,
+                            text="No device found — plug in the board", fg=YELLOW)
+        return True
 
     def _step1_next(self):
-        self.board_poll_active = False
+        self.board_detect_active = False
         port = self.board_port_var.get()
         if not port:
-            self.board_detect_label.config(text="Please connect a device first!", fg=RED)
+            _cfg_if_changed(self.board_detect_label, text="Please connect a device first!", fg=RED)
             return
         self.board_port = port
         self._show_step2()
 
     # ── Step 2: Choose Mode ──
 
-    def _show_step2(self):
-        self._clear_content()
-        self.status_var.set(f"Step 2 of 4 — Choose mode  |  Board: {self.board_port}")
-
-        tk.Label(self.content, text="STEP 2", font=("Helvetica", 10, "bold"),
+    def _build_step2(self):
+        page = self.steps[2]
+        tk.Label(page, text="STEP 2", font=("Helvetica", 10, "bold"),
                  fg=YELLOW, bg=BG).pack(anchor="w")
-        card = self._make_card(self.content, "What are you working on today?")
+        card = self._make_card(page, "What are you working on today?")
 
         tk.Label(card, text="Choose the second device to connect, or work on the board only.",
                  font=("Helvetica", 10), fg=FG, bg=BG_CARD).pack(anchor="w")
@@ -217,11 +379,15 @@ class Launchpad(tk.Tk):
                      fg=FG_DIM, bg=BG_CARD).pack(side="left")
 
         # Buttons
-        btn_frame = tk.Frame(self.content, bg=BG)
+        btn_frame = tk.Frame(page, bg=BG)
         btn_frame.pack(fill="x", pady=(10, 0))
         self._make_button(btn_frame, "<<  Back", self._show_step1, color=BG_INPUT).pack(side="left")
         self._make_button(btn_frame, "Next  >>", self._step2_next).pack(side="right")
 
+    def _show_step2(self):
+        self._set_status(f"Step 2 of 4 — Choose mode  |  Board: {self.board_port}")
+        self.steps[2].tkraise()
+
     def _step2_next(self):
         self.mode = self.mode_var.get()
         if self.mode == "board_only":
@@ -232,17 +398,16 @@ class Launchpad(tk.Tk):
 
     # ── Step 3: Connect Second Device ──
 
-    def _show_step3(self):
-        self._clear_content()
-        device_name = "Robot" if self.mode == "robo" else "Block Programmer"
-        self.status_var.set(f"Step 3 of 4 — Connect {device_name}  |  Board: {self.board_port}")
-
-        tk.Label(self.content, text="STEP 3", font=("Helvetica", 10, "bold"),
+    def _build_step3(self):
+        page = self.steps[3]
+        tk.Label(page, text="STEP 3", font=("Helvetica", 10, "bold"),
                  fg=YELLOW, bg=BG).pack(anchor="w")
-        card = self._make_card(self.content, f"Connect the {device_name} ESP32-S3")
+        # Title and hint name the device picked in Step 2
+        self.step3_title_var = tk.StringVar()
+        self.step3_hint_var = tk.StringVar()
+        card = self._make_card(page, textvariable=self.step3_title_var)
 
-        tk.Label(card, text=f"Plug in the {device_name} ESP32-S3 via USB.\n"
-                            f"It should appear as a new /dev/ttyACM* port.",
+        tk.Label(card, textvariable=self.step3_hint_var,
                  font=("Helvetica", 10), fg=FG, bg=BG_CARD, justify="left").pack(anchor="w")
 
         detect_frame = tk.Frame(card, bg=BG_CARD)
@@ -253,10 +418,12 @@ class Launchpad(tk.Tk):
 
         self.second_port_var = tk.StringVar()
         self.second_port_combo = ttk.Combobox(detect_frame, textvariable=self.second_port_var,
-                                              width=20, state="readonly")
+                                              width=20, state="readonly",
+                                              postcommand=self._refresh_second_ports)
         self.second_port_combo.pack(side="left", padx=8)
 
-        refresh_btn = tk.Button(detect_frame, text="Refresh", command=self._refresh_second_ports,
+        refresh_btn = tk.Button(detect_frame, text="Refresh",
+                                command=lambda: self._refresh_second_ports(force=True),
                                 font=("Helvetica", 9), bg=BG_INPUT, fg=FG, relief="flat",
                                 cursor="hand2", padx=8)
         refresh_btn.pack(side="left")
@@ -265,60 +432,115 @@ class Launchpad(tk.Tk):
                                             fg=FG_DIM, bg=BG_CARD)
         self.second_detect_label.pack(side="left", padx=10)
 
-        self._refresh_second_ports()
-
-        # Poll for new port
-        self.second_poll_active = True
-        self._poll_second_port()
-
         # Buttons
-        btn_frame = tk.Frame(self.content, bg=BG)
+        btn_frame = tk.Frame(page, bg=BG)
         btn_frame.pack(fill="x", pady=(10, 0))
         self._make_button(btn_frame, "<<  Back", self._back_to_step2, color=BG_INPUT).pack(side="left")
         self._make_button(btn_frame, "Next  >>", self._step3_next).pack(side="right")
 
+    def _show_step3(self):
+        device_name = "Robot" if self.mode == "robo" else "Block Programmer"
+        self._set_status(f"Step 3 of 4 — Connect {device_name}  |  Board: {self.board_port}")
+        self.step3_title_var.set(f"Connect the {device_name} ESP32-S3")
+        self.step3_hint_var.set(f"Plug in the {device_name} ESP32-S3 via USB.\n"
+                                f"It should appear as a new /dev/ttyACM* port.")
+        # The board may have moved to the port picked here on a previous visit
+        if self.second_port_var.get() == self.board_port:
+            self.second_port_var.set("")
+        _cfg_if_changed(self.second_detect_label, text="", fg=FG_DIM)
+        self._last_second_ports = None
+        self._refresh_second_ports()
+        self.second_detect_active = True
+        self._poll_interval_ms = 200
+        self.steps[3].tkraise()
+
     def _back_to_step2(self):
-        self.second_poll_active = False
+        self.second_detect_active = False
         self._show_step2()
 
-    def _refresh_second_ports(self):
-        ports = [p for p in detect_ports() if p != self.board_port]
+    def _refresh_second_ports(self, force=False):
+        """Rescan ports for this step; returns True if the list changed."""
+        ports = tuple(p for p in detect_ports() if p != self.board_port)
+        if ports == self._last_second_ports and not force:
+            return False
+        self._last_second_ports = ports
         self.second_port_combo["values"] = ports
         if ports and not self.second_port_var.get():
             self.second_port_var.set(ports[0])
-            self.second_detect_label.config(text="Detected!", fg=GREEN)
+            _cfg_if_changed(self.second_detect_label, text="Detected!", fg=GREEN)
         elif not ports:
-            self.second_detect_label.config(text="Waiting for device...", fg=YELLOW)
+            _cfg_if_changed(self.second_detect_label, text="Waiting for device...", fg=YELLOW)
+        return True
 
-    def _poll_second_port(self):
-        if not hasattr(self, 'second_poll_active') or not self.second_poll_active:
+    # ── Hot-plug detection ──
+
+    def _start_udev_watch(self):
+        """Start a pyudev observer for tty add/remove events.
+
+        Returns False when pyudev or netlink isn't available (non-Linux,
+        or the module isn't installed), in which case ports are polled.
+        """
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import pyudev
+        except ImportError:
+            return False
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by("tty")
+            observer = pyudev.MonitorObserver(
+                monitor,
+                callback=lambda device: self._schedule(0, self._on_port_event,
+                                                       device.action, device.device_node))
+            observer.start()
+        except Exception:
+            return False
+        self._udev_observer = observer
+        return True
+
+    def _on_port_event(self, action, node):
+        if not node or not os.path.basename(node).startswith(("ttyACM", "ttyUSB")):
             return
-        ports = [p for p in detect_ports() if p != self.board_port]
-        self.second_port_combo["values"] = ports
-        if ports and not self.second_port_var.get():
-            self.second_port_var.set(ports[0])
-            self.second_detect_label.config(text="Detected!", fg=GREEN)
-        self.after(1000, self._poll_second_port)
+        self._refresh_active_ports()
+
+    def _refresh_active_ports(self):
+        self._poll_interval_ms = 200
+        if getattr(self, "board_detect_active", False):
+            self._refresh_board_ports()
+        if getattr(self, "second_detect_active", False):
+            self._refresh_second_ports()
+
+    def _poll_ports(self):
+        # Fallback for when no udev watcher could start. A step whose port
+        # is already chosen isn't rescanned.
+        changed = False
+        if getattr(self, "board_detect_active", False) and not self.board_port_var.get():
+            changed |= self._refresh_board_ports()
+        if getattr(self, "second_detect_active", False) and not self.second_port_var.get():
+            changed |= self._refresh_second_ports()
+        if changed:
+            self._poll_interval_ms = 200
+        else:
+            self._poll_interval_ms = min(2000, int(self._poll_interval_ms * 1.5))
+        self._schedule(self._poll_interval_ms, self._poll_ports)
 
     def _step3_next(self):
-        self.second_poll_active = False
+        self.second_detect_active = False
         port = self.second_port_var.get()
         if not port:
-            self.second_detect_label.config(text="Please connect a device first!", fg=RED)
+            _cfg_if_changed(self.second_detect_label, text="Please connect a device first!", fg=RED)
             return
         self.second_port = port
         self._show_step4()
 
     # ── Step 4: Flash & Launch ──
 
-    def _show_step4(self):
-        self._clear_content()
-        self.status_var.set(f"Step 4 of 4 — Flash & Launch  |  Board: {self.board_port}"
-                            + (f"  |  {self.mode}: {self.second_port}" if self.second_port else ""))
-
-        tk.Label(self.content, text="STEP 4", font=("Helvetica", 10, "bold"),
+    def _build_step4(self):
+        page = self.steps[4]
+        tk.Label(page, text="STEP 4", font=("Helvetica", 10, "bold"),
                  fg=YELLOW, bg=BG).pack(anchor="w")
-        card = self._make_card(self.content, "Flash & Launch")
+        card = self._make_card(page, "Flash & Launch")
 
         # Checkboxes
         self.flash_board_var = tk.BooleanVar(value=True)
@@ -330,69 +552,45 @@ class Launchpad(tk.Tk):
         self.launch_board_gui_var = tk.BooleanVar(value=True)
         self.eyes_pupil_var = tk.BooleanVar(value=False)
 
-        # Flash section
-        flash_label = tk.Label(card, text="Flash Firmware", font=("Helvetica", 11, "bold"),
-                               fg=FG, bg=BG_CARD)
-        flash_label.pack(anchor="w", pady=(0, 4))
-
-        tk.Checkbutton(card, text=f"  Flash Board firmware  ({self.board_port})",
-                       variable=self.flash_board_var, font=("Helvetica", 10),
-                       fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                       activeforeground=FG, cursor="hand2").pack(anchor="w")
-
-        if self.second_port:
-            device_name = "Robot" if self.mode == "robo" else "Block"
-            tk.Checkbutton(card, text=f"  Flash {device_name} firmware  ({self.second_port})",
-                           variable=self.flash_second_var, font=("Helvetica", 10),
-                           fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                           activeforeground=FG, cursor="hand2").pack(anchor="w")
-
-        # Robot build options
-        if self.mode == "robo":
-            tk.Frame(card, bg=BG_INPUT, height=1).pack(fill="x", pady=8)
-            tk.Label(card, text="Robot Build Options", font=("Helvetica", 11, "bold"),
-                     fg=FG, bg=BG_CARD).pack(anchor="w", pady=(0, 4))
-            tk.Checkbutton(card, text="  Eyes with pupils  (unchecked = solid style)",
-                           variable=self.eyes_pupil_var, font=("Helvetica", 10),
-                           fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                           activeforeground=FG, cursor="hand2").pack(anchor="w")
+        # Labels that name the ports and second device, set in _show_step4
+        self.step4_text = {k: tk.StringVar() for k in (
+            "flash_board", "flash_second", "monitor_board", "monitor_second", "gui")}
+        text = self.step4_text
 
-        tk.Frame(card, bg=BG_INPUT, height=1).pack(fill="x", pady=8)
+        # Flash section
+        flash_frame = tk.Frame(card, bg=BG_CARD)
+        flash_frame.pack(fill="x")
+        flash_rows = self._make_section(flash_frame, "Flash Firmware", (
+            (text["flash_board"], self.flash_board_var),
+            (text["flash_second"], self.flash_second_var),
+        ))
+
+        # Robot build options, shown in robo mode only
+        self.robo_opts_frame = tk.Frame(card, bg=BG_CARD)
+        tk.Frame(self.robo_opts_frame, bg=BG_INPUT, height=1).pack(fill="x", pady=8)
+        self._make_section(self.robo_opts_frame, "Robot Build Options", (
+            ("  Eyes with pupils  (unchecked = solid style)", self.eyes_pupil_var),
+        ))
+
+        self.launch_sep = tk.Frame(card, bg=BG_INPUT, height=1)
+        self.launch_sep.pack(fill="x", pady=8)
 
         # Launch section
-        tk.Label(card, text="Launch Tools", font=("Helvetica", 11, "bold"),
-                 fg=FG, bg=BG_CARD).pack(anchor="w", pady=(0, 4))
-
-        tk.Checkbutton(card, text="  Open project in VS Code",
-                       variable=self.open_vscode_var, font=("Helvetica", 10),
-                       fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                       activeforeground=FG, cursor="hand2").pack(anchor="w")
-
-        tk.Checkbutton(card, text=f"  Open Board monitor  ({self.board_port})",
-                       variable=self.launch_monitor_board_var, font=("Helvetica", 10),
-                       fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                       activeforeground=FG, cursor="hand2").pack(anchor="w")
-
-        tk.Checkbutton(card, text="  Launch Board Monitor GUI",
-                       variable=self.launch_board_gui_var, font=("Helvetica", 10),
-                       fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                       activeforeground=FG, cursor="hand2").pack(anchor="w")
-
-        if self.second_port:
-            device_name = "Robot" if self.mode == "robo" else "Block"
-            tk.Checkbutton(card, text=f"  Open {device_name} monitor  ({self.second_port})",
-                           variable=self.launch_monitor_second_var, font=("Helvetica", 10),
-                           fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                           activeforeground=FG, cursor="hand2").pack(anchor="w")
-
-            gui_name = "Robot Simulator" if self.mode == "robo" else "Block Programmer GUI"
-            tk.Checkbutton(card, text=f"  Launch {gui_name}",
-                           variable=self.launch_gui_var, font=("Helvetica", 10),
-                           fg=FG, bg=BG_CARD, selectcolor=BG_INPUT, activebackground=BG_CARD,
-                           activeforeground=FG, cursor="hand2").pack(anchor="w")
+        launch_frame = tk.Frame(card, bg=BG_CARD)
+        launch_frame.pack(fill="x")
+        launch_rows = self._make_section(launch_frame, "Launch Tools", (
+            ("  Open project in VS Code", self.open_vscode_var),
+            (text["monitor_board"], self.launch_monitor_board_var),
+            ("  Launch Board Monitor GUI", self.launch_board_gui_var),
+            (text["monitor_second"], self.launch_monitor_second_var),
+            (text["gui"], self.launch_gui_var),
+        ))
+        # Rows for the second device; each is last in its section, so
+        # packing them again puts them back in place
+        self.second_rows = [flash_rows[1]] + launch_rows[3:]
 
         # Output area
-        self.output_frame = tk.Frame(self.content, bg=BG)
+        self.output_frame = tk.Frame(page, bg=BG)
         self.output_frame.pack(fill="both", expand=True, pady=(5, 0))
 
         self.output_text = tk.Text(self.output_frame, wrap="word", font=("monospace", 9),
@@ -408,110 +606,195 @@ class Launchpad(tk.Tk):
         self.output_text.tag_configure("info", foreground=ACCENT)
 
         # Buttons
-        btn_frame = tk.Frame(self.content, bg=BG)
+        btn_frame = tk.Frame(page, bg=BG)
         btn_frame.pack(fill="x", pady=(8, 0))
 
-        back_target = self._show_step3 if self.second_port else self._show_step2
-        self._make_button(btn_frame, "<<  Back", back_target, color=BG_INPUT).pack(side="left")
+        self._make_button(btn_frame, "<<  Back", self._step4_back, color=BG_INPUT).pack(side="left")
         self.launch_btn = self._make_button(btn_frame, "Launch!", self._do_launch, color=GREEN)
         self.launch_btn.pack(side="right")
 
-    def _log(self, text, tag=None):
-        self.output_text.configure(state="normal")
-        if tag:
-            self.output_text.insert("end", text, tag)
+    def _show_step4(self):
+        self._set_status(f"Step 4 of 4 — Flash & Launch  |  Board: {self.board_port}"
+                         + (f"  |  {self.mode}: {self.second_port}" if self.second_port else ""))
+
+        device_name = "Robot" if self.mode == "robo" else "Block"
+        gui_name = "Robot Simulator" if self.mode == "robo" else "Block Programmer GUI"
+        text = self.step4_text
+        text["flash_board"].set(f"  Flash Board firmware  ({self.board_port})")
+        text["flash_second"].set(f"  Flash {device_name} firmware  ({self.second_port})")
+        text["monitor_board"].set(f"  Open Board monitor  ({self.board_port})")
+        text["monitor_second"].set(f"  Open {device_name} monitor  ({self.second_port})")
+        text["gui"].set(f"  Launch {gui_name}")
+
+        for cb in self.second_rows:
+            if not self.second_port:
+                cb.pack_forget()
+            elif not cb.winfo_manager():
+                cb.pack(anchor="w")
+        if self.mode == "robo":
+            self.robo_opts_frame.pack(fill="x", before=self.launch_sep)
         else:
-            self.output_text.insert("end", text)
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+            self.robo_opts_frame.pack_forget()
+        self.steps[4].tkraise()
+
+    def _step4_back(self):
+        if self.second_port:
+            self._show_step3()
+        else:
+            self._show_step2()
+
+    def _log(self, text, tag=None):
+        """Queue text for the Step 4 output; safe to call from any thread."""
+        self._log_q.append((text, tag))
+
+    def _drain_log(self):
+        # Insert everything queued since the last tick, one insert per run
+        # of same-tag text
+        runs = []
+        for _ in range(200):
+            try:
+                text, tag = self._log_q.popleft()
+            except IndexError:
+                break
+            if runs and runs[-1][1] == tag:
+                runs[-1][0].append(text)
+            else:
+                runs.append(([text], tag))
+        out = self.output_text
+        if runs:
+            # Follow the output only if the user hasn't scrolled up
+            at_bottom = out.yview()[1] >= 0.999
+            out.configure(state="normal")
+            for texts, tag in runs:
+                out.insert("end", "".join(texts), tag or ())
+            lines = int(out.index("end-1c").split(".")[0])
+            if lines > OUTPUT_MAX_LINES:
+                out.delete("1.0", f"{lines - OUTPUT_MAX_LINES}.0")
+            if at_bottom:
+                out.see("end")
+            out.configure(state="disabled")
 
     def _do_launch(self):
+        import threading
         self.launch_btn.configure(state="disabled")
         threading.Thread(target=self._launch_worker, daemon=True).start()
 
     def _launch_worker(self):
-        # Flash board
-        if self.flash_board_var.get():
-            self.after(0, self._log, ">>> Building & flashing Board...\n", "info")
-            self.after(0, lambda: self.status_var.set("Flashing Board..."))
-            ok = self._run_flash("board", self.board_port, "Board")
-            if ok:
-                self.after(0, self._log, "Board flash OK!\n\n", "ok")
-            else:
-                self.after(0, self._log, "Board flash FAILED!\n\n", "err")
+        import concurrent.futures
 
-        # Flash second
+        # Flash board and second device; they use different ports and
+        # project dirs, so both builds run at the same time
+        flashes = []
+        if self.flash_board_var.get():
+            flashes.append(("board", self.board_port, "Board"))
         if self.second_port and self.flash_second_var.get():
             project = "robo" if self.mode == "robo" else "block"
             name = "Robot" if self.mode == "robo" else "Block"
-            self.after(0, self._log, f">>> Building & flashing {name}...\n", "info")
-            self.after(0, lambda: self.status_var.set(f"Flashing {name}..."))
-            ok = self._run_flash(project, self.second_port, name)
-            if ok:
-                self.after(0, self._log, f"{name} flash OK!\n\n", "ok")
-            else:
-                self.after(0, self._log, f"{name} flash FAILED!\n\n", "err")
+            flashes.append((project, self.second_port, name))
+
+        if flashes:
+            for _, _, name in flashes:
+                self._log(f">>> Building & flashing {name}...\n", "info")
+            self._set_status(f"Flashing {' & '.join(n for _, _, n in flashes)}...")
+            # Label each line of output when two builds are interleaved
+            labelled = len(flashes) > 1
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+                futs = {ex.submit(self._run_flash, project, port, name,
+                                  f"[{name}] " if labelled else ""): name
+                        for project, port, name in flashes}
+                for fut in concurrent.futures.as_completed(futs):
+                    name = futs[fut]
+                    if fut.result():
+                        self._log(f"{name} flash OK!\n\n", "ok")
+                    else:
+                        self._log(f"{name} flash FAILED!\n\n", "err")
 
         # Launch tools
-        self.after(0, lambda: self.status_var.set("Launching tools..."))
+        self._set_status("Launching tools...")
 
         if self.open_vscode_var.get():
-            self.after(0, self._open_vscode)
+            self._schedule(0, self._open_vscode)
 
         if self.launch_monitor_board_var.get():
-            self.after(0, lambda: self._open_monitor(self.board_port, "board", "Board"))
+            self._schedule(0, self._open_monitor, self.board_port, "board", "Board")
 
         if self.second_port and self.launch_monitor_second_var.get():
             project = "robo" if self.mode == "robo" else "block"
             name = "Robot" if self.mode == "robo" else "Block"
-            self.after(100, lambda: self._open_monitor(self.second_port, project, name))
+            self._schedule(100, self._open_monitor, self.second_port, project, name)
 
         if self.launch_board_gui_var.get():
-            self.after(200, self._open_board_gui)
+            self._schedule(200, self._open_board_gui)
 
         if self.second_port and self.launch_gui_var.get():
-            self.after(300, self._open_gui)
+            self._schedule(300, self._open_gui)
 
-        self.after(0, self._log, ">>> All done!\n", "ok")
-        self.after(0, lambda: self.status_var.set("Ready! All tools launched."))
-        self.after(0, lambda: self.launch_btn.configure(state="normal"))
+        self._schedule(0, self._log, ">>> All done!\n", "ok")
+        self._set_status("Ready! All tools launched.")
+        self._schedule(0, lambda: self.launch_btn.configure(state="normal"))
 
-    def _run_flash(self, project, port, name):
-        project_dir = os.path.join(PROJECT_ROOT, project)
-        export_script = os.path.join(IDF_PATH, "export.sh")
+    def _run_flash(self, project, port, name, prefix=""):
+        import codecs
+        import subprocess
+        project_dir = PROJECT_DIRS[project]
 
         # Set eye style config before building robot firmware
         if project == "robo":
             self._set_robo_eye_style(project_dir)
 
-        cmd = f'source "{export_script}" && cd "{project_dir}" && idf.py -p {port} build flash'
+        cmd = f'source "{EXPORT_SCRIPT}" && cd "{project_dir}" && idf.py -p {port} build flash'
 
         try:
             proc = subprocess.Popen(
                 ["bash", "-c", cmd],
                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                text=True, bufsize=1,
+                bufsize=0,
             )
-            for line in proc.stdout:
-                self.after(0, self._log, line)
+            # Read whatever the build has written, up to 64 KB at a time,
+            # rather than one Python iteration per line
+            fd = proc.stdout.fileno()
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            partial = ""
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                if not prefix:
+                    self._log(text)
+                    continue
+                # Labelled output goes out in whole lines only
+                head, sep, partial = (partial + text).rpartition("\n")
+                if sep:
+                    self._log("".join(prefix + line
+                                      for line in (head + sep).splitlines(True)))
+            # Flush a multi-byte sequence cut off at EOF as U+FFFD
+            text = decoder.decode(b"", final=True)
+            if not prefix:
+                if text:
+                    self._log(text)
+            else:
+                partial += text
+            if partial:
+                self._log(prefix + partial + "\n")
+            proc.stdout.close()
             proc.wait()
             ok = proc.returncode == 0
 
             # For board: verify PCA9548A I2C mux is responding
             if ok and project == "board":
-                self.after(0, self._log, "\n>>> Verifying I2C mux (PCA9548A)...\n", "info")
+                self._log("\n>>> Verifying I2C mux (PCA9548A)...\n", "info")
                 time.sleep(2)  # wait for ESP to boot
                 mux_ok = self._check_board_i2c(port)
                 if not mux_ok:
-                    self.after(0, self._log,
-                               "WARNING: PCA9548A I2C mux not detected!\n"
-                               "Check wiring: SDA=GPIO8, SCL=GPIO9, MUX addr=0x70\n", "err")
+                    self._log("WARNING: PCA9548A I2C mux not detected!\n"
+                              "Check wiring: SDA=GPIO8, SCL=GPIO9, MUX addr=0x70\n", "err")
                 else:
-                    self.after(0, self._log, "PCA9548A I2C mux OK!\n", "ok")
+                    self._log("PCA9548A I2C mux OK!\n", "ok")
 
             return ok
         except Exception as e:
-            self.after(0, self._log, f"Error: {e}\n", "err")
+            self._log(f"Error: {e}\n", "err")
             return False
 
     def _set_robo_eye_style(self, project_dir):
@@ -526,11 +809,11 @@ class Launchpad(tk.Tk):
         if self.eyes_pupil_var.get():
             lines.append("CONFIG_ROBO_EYES_STYLE_PUPIL=y\n")
             lines.append("# CONFIG_ROBO_EYES_STYLE_SOLID is not set\n")
-            self.after(0, self._log, "Eye style: with pupils\n", "info")
+            self._log("Eye style: with pupils\n", "info")
         else:
             lines.append("CONFIG_ROBO_EYES_STYLE_SOLID=y\n")
             lines.append("# CONFIG_ROBO_EYES_STYLE_PUPIL is not set\n")
-            self.after(0, self._log, "Eye style: solid (no pupils)\n", "info")
+            self._log("Eye style: solid (no pupils)\n", "info")
 
         with open(sdkconfig, "w") as f:
             f.writelines(lines)
@@ -539,38 +822,45 @@ class Launchpad(tk.Tk):
         """Read boot output from board to check if I2C mux initialized."""
         import serial as ser
         try:
-            s = ser.Serial(port, 115200, timeout=3)
+            s = ser.Serial(port, 115200, timeout=0.1)
+            # FTDI adapters hold bytes for 16 ms by default; ask for 1 ms
+            try:
+                with open(f"/sys/bus/usb-serial/devices/{os.path.basename(port)}"
+                          "/latency_timer", "w") as f:
+                    f.write("1")
+            except OSError:
+                pass
             time.sleep(0.5)
             s.reset_input_buffer()
-            # Read lines for a few seconds looking for I2C status
-            deadline = time.time() + 5
-            while time.time() < deadline:
-                raw = s.readline().decode(errors="replace")
-                if "I2C bus ready" in raw or "Polling channels" in raw:
+            # Read whatever has arrived for a few seconds looking for I2C
+            # status; keep a short tail so a marker split across reads matches
+            buf = b""
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                buf += s.read(max(1, s.in_waiting))
+                if b"I2C bus ready" in buf or b"Polling channels" in buf:
                     s.close()
                     return True
-                if "EEPROM init failed" in raw:
+                if b"EEPROM init failed" in buf:
                     s.close()
                     return False
+                buf = buf[-32:]
             s.close()
             # If we didn't see either message, try a reset and read again
             return False
         except Exception as e:
-            self.after(0, self._log, f"Serial check error: {e}\n", "err")
+            self._log(f"Serial check error: {e}\n", "err")
             return False
 
     def _open_vscode(self):
         try:
-            subprocess.Popen(["code", PROJECT_ROOT],
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            _spawn(["code", PROJECT_ROOT])
             self._log("Opened VS Code\n", "ok")
         except FileNotFoundError:
             self._log("VS Code 'code' command not found\n", "err")
 
     def _open_monitor(self, port, project, name):
-        project_dir = os.path.join(PROJECT_ROOT, project)
-        export_script = os.path.join(IDF_PATH, "export.sh")
-        cmd = f'source "{export_script}" && cd "{project_dir}" && idf.py -p {port} monitor'
+        cmd = f'source "{EXPORT_SCRIPT}" && cd "{PROJECT_DIRS[project]}" && idf.py -p {port} monitor'
 
         terminals = [
             ["gnome-terminal", "--title", f"Bloco {name} Monitor", "--",
@@ -580,7 +870,7 @@ class Launchpad(tk.Tk):
         ]
         for term_cmd in terminals:
             try:
-                subprocess.Popen(term_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                _spawn(term_cmd)
                 self._log(f"Opened {name} monitor ({port})\n", "ok")
                 return
             except FileNotFoundError:
@@ -588,24 +878,21 @@ class Launchpad(tk.Tk):
         self._log(f"Could not open terminal for {name} monitor\n", "err")
 
     def _open_board_gui(self):
-        tool = os.path.join(PROJECT_ROOT, "board", "tools", "board_monitor.py")
         try:
-            subprocess.Popen([sys.executable, tool],
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            _spawn([sys.executable, BOARD_GUI])
             self._log("Launched Board Monitor GUI\n", "ok")
         except Exception as e:
             self._log(f"Failed to launch Board Monitor GUI: {e}\n", "err")
 
     def _open_gui(self):
         if self.mode == "robo":
-            tool = os.path.join(PROJECT_ROOT, "robo", "tools", "robo_sim.py")
+            tool = ROBO_GUI
             name = "Robot Simulator"
         else:
-            tool = os.path.join(PROJECT_ROOT, "block", "tools", "block_gui.py")
+            tool = BLOCK_GUI
             name = "Block Programmer GUI"
         try:
-            subprocess.Popen([sys.executable, tool],
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            _spawn([sys.executable, tool])
             self._log(f"Launched {name}\n", "ok")
         except Exception as e:
             self._log(f"Failed to launch {name}: {e}\n", "err")